@@ -0,0 +1,494 @@
+"""
+Модуль для измерения производительности проверки ссылок.
+
+Этот модуль запускает локальный HTTP-сервер с искусственным сайтом новостей
+в той же разметке, которую ожидает `checker.py` (`div.image > a`, `.pagination`,
+`#content`, `h1`), и проверяет его объектом `LinkChecker` с разными источниками
+страниц и разным числом потоков. Каждый запуск выполняется в отдельном процессе,
+и для него выводятся страницы в секунду, ссылки в секунду, пиковая память
+процесса и процентили длительности этапов.
+Результаты дописываются в файл JSONL вместе с версией кода, поэтому замедление
+между версиями видно при сравнении с предыдущим запуском тех же параметров.
+
+Пример использования:
+```bash
+python bench.py --pages 10 --per-page 20 --links 15 --dead 0.1 --slow 0.05 \
+    --backend http --article-workers 1 4 8
+```
+"""
+
+import argparse
+import gzip
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing import get_context
+from checker import LinkChecker
+from discovery import DISCOVERY_MODES
+from logs import start_logging, stop_logging
+from metrics import METRICS
+from pages import BACKENDS
+from utils import set_quiet
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class _Server(ThreadingHTTPServer):
+    """
+    HTTP-сервер искусственного сайта. Очередь соединений увеличена: при
+    стандартной длине 5 часть соединений отбрасывается, и клиент ждет
+    повторной отправки SYN около секунды, что искажает замеры.
+    """
+    daemon_threads = True
+    request_queue_size = 256
+
+
+class FixtureSite:
+    """
+    Искусственный сайт новостей на локальном HTTP-сервере.
+
+    Атрибуты:
+        pages (int): Число страниц со списком новостей.
+        per_page (int): Число новостей на странице.
+        links (int): Число ссылок в каждой новости.
+        dead (float): Доля ссылок, которые отвечают 404.
+        slow (float): Доля ссылок, которые отвечают с задержкой `slow_delay`.
+        redirect (float): Доля ссылок, которые перенаправляют на рабочую страницу.
+        slow_delay (float): Задержка медленных ссылок в секундах.
+    """
+    def __init__(self, pages=5, per_page=10, links=10, dead=0.1, slow=0.05,
+                 redirect=0.1, slow_delay=0.5, seed=1):
+        """
+        Инициализация объекта FixtureSite.
+
+        Аргументы:
+            pages (int): Число страниц со списком новостей.
+            per_page (int): Число новостей на странице.
+            links (int): Число ссылок в каждой новости.
+            dead (float): Доля ссылок, которые отвечают 404.
+            slow (float): Доля ссылок, которые отвечают с задержкой.
+            redirect (float): Доля ссылок, которые перенаправляют на рабочую страницу.
+            slow_delay (float): Задержка медленных ссылок в секундах.
+            seed (int): Начальное значение генератора, чтобы сайт был одинаковым
+                во всех запусках.
+        """
+        self.pages = pages
+        self.per_page = per_page
+        self.links = links
+        self.dead = dead
+        self.slow = slow
+        self.redirect = redirect
+        self.slow_delay = slow_delay
+        self.seed = seed
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """
+        Адрес первой страницы со списком новостей.
+        """
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/news/"
+
+    @property
+    def expected_broken(self) -> int:
+        """
+        Число ссылок, которые должны попасть в отчет.
+        """
+        return sum(kind == 'dead' for article in range(self.pages * self.per_page)
+                   for kind in self._link_kinds(article))
+
+    def start(self):
+        """
+        Запускает сервер на свободном порту в фоновом потоке.
+        """
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """Обработчик запросов к искусственному сайту."""
+            def do_HEAD(self): # pylint: disable=invalid-name
+                site.handle(self, body=False)
+
+            def do_GET(self): # pylint: disable=invalid-name
+                site.handle(self, body=True)
+
+            def log_message(self, *args): # pylint: disable=arguments-differ
+                pass
+
+        self._server = _Server(('127.0.0.1', 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Останавливает сервер.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+
+    def handle(self, request, body):
+        """
+        Отвечает на запрос к сайту.
+
+        Аргументы:
+            request (BaseHTTPRequestHandler): Текущий запрос.
+            body (bool): Отправлять ли тело ответа (False для HEAD).
+        """
+        path, _, query = request.path.partition('?')
+        parts = [part for part in path.split('/') if part]
+        status, headers, html = 404, {}, "<h1>Not found</h1>"
+        content_type, data = 'text/html; charset=utf-8', None
+
+        if path == '/robots.txt':
+            status, content_type = 200, 'text/plain; charset=utf-8'
+            html = f"User-agent: *\nSitemap: http://{request.headers['Host']}/sitemap.xml\n"
+        elif path == '/sitemap.xml':
+            status, content_type = 200, 'application/xml'
+            html = ('<?xml version="1.0" encoding="UTF-8"?>'
+                    '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                    '<sitemap><loc>/sitemap-news.xml.gz</loc></sitemap></sitemapindex>')
+        elif path == '/sitemap-news.xml.gz':
+            status, content_type = 200, 'application/gzip'
+            data = gzip.compress(self._sitemap(request.headers['Host']).encode('utf-8'))
+        elif parts == ['news']:
+            page = int(query.split('=')[1]) if query.startswith('PAGEN_1=') else 1
+            if 1 <= page <= self.pages:
+                status, html = 200, self._listing(page)
+        elif len(parts) == 2 and parts[0] == 'news' and parts[1].startswith('item-'):
+            article = int(parts[1][len('item-'):])
+            if article < self.pages * self.per_page:
+                status, html = 200, self._article(article)
+        elif len(parts) == 3 and parts[0] == 'target':
+            kind = parts[1]
+            if kind == 'slow':
+                time.sleep(self.slow_delay)
+            if kind == 'redirect':
+                status, headers = 301, {'Location': f"/target/ok/{parts[2]}"}
+            elif kind in ('ok', 'slow'):
+                status, html = 200, "<p>ok</p>"
+
+        if data is None:
+            data = html.encode('utf-8')
+        request.send_response(status)
+        request.send_header('Content-Type', content_type)
+        request.send_header('Content-Length', str(len(data)))
+        for name, value in headers.items():
+            request.send_header(name, value)
+        request.end_headers()
+        if body:
+            request.wfile.write(data)
+
+    def _link_kinds(self, article):
+        """
+        Возвращает типы ссылок новости: ok, dead, slow или redirect.
+
+        Аргументы:
+            article (int): Номер новости.
+        """
+        rng = random.Random(self.seed * 1_000_003 + article)
+        kinds = []
+        for _ in range(self.links):
+            roll = rng.random()
+            if roll < self.dead:
+                kinds.append('dead')
+            elif roll < self.dead + self.slow:
+                kinds.append('slow')
+            elif roll < self.dead + self.slow + self.redirect:
+                kinds.append('redirect')
+            else:
+                kinds.append('ok')
+        return kinds
+
+    def _listing(self, page):
+        """
+        Возвращает HTML страницы со списком новостей.
+
+        Аргументы:
+            page (int): Номер страницы, начиная с 1.
+        """
+        first = (page - 1) * self.per_page
+        items = ''.join(
+            f'<div class="item"><div class="image"><a href="/news/item-{n}/">'
+            f'<img src="/img/{n}.jpg"></a></div></div>'
+            for n in range(first, first + self.per_page)
+        )
+        # Как на настоящих сайтах, видны только соседние страницы и последняя.
+        pagination = ''.join(
+            f'<a href="/news/?PAGEN_1={n}">{n}</a>'
+            for n in range(max(1, page - 2), min(self.pages, page + 2) + 1)
+        ) + f'<a href="/news/?PAGEN_1={self.pages}">Последняя</a>'
+        return (f'<html><body><h1>Новости</h1><div class="news">{items}</div>'
+                f'<div class="pagination">{pagination}</div></body></html>')
+
+    def _sitemap(self, host):
+        """
+        Возвращает карту сайта со всеми новостями и страницами списка.
+
+        Аргументы:
+            host (str): Хост сайта из заголовка Host.
+        """
+        urls = [f"http://{host}/news/"] + [
+            f"http://{host}/news/item-{n}/" for n in range(self.pages * self.per_page)
+        ]
+        items = ''.join(f'<url><loc>{url}</loc></url>' for url in urls)
+        return ('<?xml version="1.0" encoding="UTF-8"?>'
+                f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{items}</urlset>')
+
+    def _article(self, article):
+        """
+        Возвращает HTML новости со ссылками в блоке #content.
+
+        Аргументы:
+            article (int): Номер новости.
+        """
+        links = ''.join(
+            f'<p><a href="/target/{kind}/{article}-{i}">Ссылка {i}</a></p>'
+            for i, kind in enumerate(self._link_kinds(article))
+        )
+        return (f'<html><body><h1>Новость {article}</h1>'
+                f'<div id="content">{links}</div></body></html>')
+
+
+def peak_rss_mb():
+    """
+    Возвращает пиковую память процесса и его завершенных дочерних процессов
+    (Chrome) в МБ за все время работы процесса, поэтому каждый замер
+    выполняется в отдельном процессе.
+
+    Возвращает:
+        float | None: Пиковая память или None, если ее нельзя узнать на этой ОС.
+    """
+    if resource is None:
+        return None
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round((own + children) / scale, 1)
+
+
+def code_version():
+    """
+    Возвращает хэш текущего коммита git или None, если git недоступен.
+    """
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+            check=True, cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_once(url, backend, article_workers, probe_workers, per_host, discovery='listing'):
+    """
+    Проверяет искусственный сайт один раз и измеряет производительность.
+
+    Аргументы:
+        url (str): Адрес первой страницы со списком новостей искусственного сайта.
+        backend (str): Источник страниц.
+        article_workers (int): Число новостей, которые обрабатываются одновременно.
+        probe_workers (int): Число потоков для проверки ссылок.
+        per_host (int): Число одновременных запросов к одному хосту.
+        discovery (str): Способ поиска новостей: `listing`, `sitemap` или `auto`.
+
+    Возвращает:
+        dict: Параметры и результаты запуска.
+    """
+    METRICS.reset()
+    # Ограничение частоты запросов нужно для чужих сайтов, а локальный
+    # сайт проверяется без него, чтобы измерять скорость самой программы.
+    checker = LinkChecker([url], backend=backend, probe_workers=probe_workers,
+                          probe_per_host=per_host, probe_host_rate=0,
+                          article_workers=article_workers, discovery=discovery,
+                          report_formats=('jsonl',))
+    started = time.perf_counter()
+    try:
+        summary = checker.check_links(url)
+    finally:
+        checker.close()
+    elapsed = time.perf_counter() - started
+
+    phases = {
+        phase: {q: data[q] for q in ('count', 'p50', 'p90', 'p99')}
+        for phase, data in METRICS.phases().items()
+        if phase in ('listing_load', 'sitemap_load', 'article_open', 'link_probe')
+    }
+    # Учитываются только действительно загруженные страницы: при поиске
+    # по картам сайта страницы списка не загружаются.
+    pages = summary.articles + phases.get('listing_load', {}).get('count', 0)
+    return {
+        'backend': backend,
+        'discovery': discovery,
+        'article_workers': article_workers,
+        'probe_workers': probe_workers,
+        'per_host': per_host,
+        'elapsed': round(elapsed, 3),
+        'pages_per_s': round(pages / elapsed, 2),
+        'links_per_s': round(summary.links / elapsed, 2),
+        'articles': summary.articles,
+        'links': summary.links,
+        'broken': summary.broken,
+        'peak_rss_mb': peak_rss_mb(),
+        'phases': phases,
+    }
+
+
+def _run_in_process(log_path, *args):
+    """
+    Выполняет `run_once` в процессе-обработчике замера.
+
+    Аргументы:
+        log_path (str): Путь к файлу логов.
+        *args: Аргументы `run_once`.
+    """
+    set_quiet(True)
+    start_logging(log_path)
+    try:
+        return run_once(*args)
+    finally:
+        stop_logging()
+
+
+def measure(log_path, *args):
+    """
+    Выполняет `run_once` в новом процессе.
+
+    Аргументы:
+        log_path (str): Путь к файлу логов.
+        *args: Аргументы `run_once`.
+
+    Описание:
+        Пиковая память процесса не уменьшается до его завершения, поэтому
+        в одном процессе все следующие замеры показывали бы самый большой
+        из предыдущих пиков. Процесс запускается способом spawn, чтобы
+        не наследовать память и потоки текущего процесса.
+
+    Возвращает:
+        dict: Параметры и результаты запуска.
+    """
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as pool:
+        return pool.submit(_run_in_process, log_path, *args).result()
+
+
+def previous_result(path, key):
+    """
+    Находит последний сохраненный результат с теми же параметрами.
+
+    Аргументы:
+        path (str): Файл с результатами.
+        key (dict): Параметры запуска.
+
+    Возвращает:
+        dict | None: Предыдущий результат или None.
+    """
+    if not os.path.exists(path):
+        return None
+    found = None
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            record = json.loads(line)
+            if all(record.get(name) == value for name, value in key.items()):
+                found = record
+    return found
+
+
+def main(argv=None):
+    """
+    Запускает серию замеров и сохраняет результаты.
+
+    Аргументы:
+        argv (list, optional): Аргументы командной строки.
+
+    Возвращает:
+        int: Код возврата: 0, если все запуски нашли ожидаемое число
+            неработающих ссылок, иначе 1.
+    """
+    parser = argparse.ArgumentParser(description="Замер производительности проверки ссылок.")
+    parser.add_argument('--pages', type=int, default=5, help="число страниц со списком новостей")
+    parser.add_argument('--per-page', type=int, default=10, help="число новостей на странице")
+    parser.add_argument('--links', type=int, default=10, help="число ссылок в новости")
+    parser.add_argument('--dead', type=float, default=0.1, help="доля ссылок с ответом 404")
+    parser.add_argument('--slow', type=float, default=0.05, help="доля медленных ссылок")
+    parser.add_argument('--redirect', type=float, default=0.1,
+                        help="доля ссылок с перенаправлением")
+    parser.add_argument('--slow-delay', type=float, default=0.5,
+                        help="задержка медленных ссылок в секундах")
+    parser.add_argument('--backend', dest='backends', action='append', choices=BACKENDS,
+                        help="источник страниц, можно указать несколько раз (по умолчанию http)")
+    parser.add_argument('--discovery', choices=DISCOVERY_MODES, default='listing',
+                        help="способ поиска новостей (по умолчанию listing)")
+    parser.add_argument('--article-workers', type=int, nargs='+', default=[4],
+                        help="одно или несколько значений числа потоков для новостей")
+    parser.add_argument('--probe-workers', type=int, default=20,
+                        help="число потоков для проверки ссылок")
+    parser.add_argument('--per-host', type=int, default=4,
+                        help="число одновременных запросов к одному хосту; весь "
+                             "искусственный сайт работает на одном хосте")
+    parser.add_argument('--results', default='bench_results.jsonl',
+                        help="файл, в который дописываются результаты")
+    args = parser.parse_args(argv)
+
+    set_quiet(True)
+    version = code_version()
+    site = FixtureSite(args.pages, args.per_page, args.links, args.dead, args.slow,
+                       args.redirect, args.slow_delay).start()
+    results_path = os.path.abspath(args.results)
+    workdir = os.getcwd()
+    failed = False
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            for backend in args.backends or ['http']:
+                for article_workers in args.article_workers:
+                    result = measure(os.path.join(tmp, 'error_logs.txt'), site.url, backend,
+                                     article_workers, args.probe_workers, args.per_host,
+                                     args.discovery)
+                    result['expected_broken'] = site.expected_broken
+                    key = {
+                        'backend': backend,
+                        'discovery': args.discovery,
+                        'article_workers': article_workers,
+                        'probe_workers': args.probe_workers,
+                        'per_host': args.per_host,
+                        'site': [args.pages, args.per_page, args.links, args.dead,
+                                 args.slow, args.redirect, args.slow_delay],
+                    }
+                    previous = previous_result(results_path, key)
+                    record = {**key, **result, 'version': version, 'timestamp': time.time()}
+                    with open(results_path, 'a', encoding='utf-8') as f:
+                        f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+                    line = (f"{backend:8} workers={article_workers:<3} "
+                            f"{result['pages_per_s']:>8} стр/с {result['links_per_s']:>9} ссылок/с "
+                            f"RSS={result['peak_rss_mb']} МБ "
+                            f"p90 ссылки={result['phases'].get('link_probe', {}).get('p90')} с")
+                    if previous and previous.get('links_per_s'):
+                        change = result['links_per_s'] / previous['links_per_s'] - 1
+                        line += f" ({change:+.0%} к {previous.get('version')})"
+                    if result['broken'] != result['expected_broken']:
+                        failed = True
+                        line += (f" ОШИБКА: найдено {result['broken']} неработающих ссылок "
+                                 f"вместо {result['expected_broken']}")
+                    print(line)
+            # Выходим из временного каталога до его удаления (нужно для Windows)
+            os.chdir(workdir)
+    finally:
+        os.chdir(workdir)
+        site.stop()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+"""Модуль кэша результатов проверки ссылок.
+
+Этот модуль содержит класс `LinkCache`, который хранит результаты проверки
+ссылок, чтобы каждая уникальная ссылка проверялась один раз за запуск.
+Кэш общий для всех потоков `LinkChecker`, ограничен по размеру (LRU)
+и по времени жизни записей (TTL). Дополнительно рабочие ссылки могут
+сохраняться в SQLite, чтобы следующий запуск пропускал недавно проверенные адреса.
+
+Пример использования:
+```python
+cache = LinkCache(path='link_cache.sqlite3', max_age=12 * 3600)
+cache.put(result)
+cached = cache.get('https://example.com/')
+cache.close()
+```
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from prober import ProbeResult
+from utils import connect_database, normalize_url
+
+
+class LinkCache:
+    """
+    Потокобезопасный кэш результатов проверки ссылок.
+
+    Атрибуты:
+        max_size (int): Максимальное число записей в памяти.
+        ttl (float): Время жизни записи в памяти в секундах.
+        max_age (float): Время, в течение которого рабочая ссылка из файла
+            считается проверенной, в секундах.
+    """
+    def __init__(self, max_size=100_000, ttl=3600, path=None, max_age=12 * 3600):
+        """
+        Инициализация объекта LinkCache.
+
+        Аргументы:
+            max_size (int): Максимальное число записей в памяти.
+            ttl (float): Время жизни записи в памяти в секундах.
+            path (str, optional): Путь к файлу SQLite для хранения между запусками.
+                Если не указан, кэш хранится только в памяти.
+            max_age (float): Время, в течение которого рабочая ссылка из файла
+                считается проверенной, в секундах.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.max_age = max_age
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            self._db = connect_database(path)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS links "
+                "(url TEXT PRIMARY KEY, data TEXT NOT NULL, checked_at REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    def get(self, url):
+        """
+        Возвращает сохраненный результат проверки ссылки.
+
+        Аргументы:
+            url (str): Ссылка для поиска в кэше.
+
+        Возвращает:
+            ProbeResult | None: Результат проверки или None, если записи нет
+                или она устарела.
+        """
+        key = normalize_url(url)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                result, stored_at = entry
+                if now - stored_at < self.ttl:
+                    self._entries.move_to_end(key)
+                    return result
+                del self._entries[key]
+
+            if self._db is None:
+                return None
+            row = self._db.execute(
+                "SELECT data FROM links WHERE url = ? AND checked_at > ?",
+                (key, now - self.max_age)
+            ).fetchone()
+            if row is None:
+                return None
+            data = json.loads(row[0])
+            data['redirects'] = tuple(data.get('redirects', ()))
+            result = ProbeResult(**data)
+            self._remember(key, result, now)
+            return result
+
+    def put(self, result) -> None:
+        """
+        Сохраняет результат проверки ссылки.
+
+        Аргументы:
+            result (ProbeResult): Результат проверки.
+
+        Описание:
+            - Запоминает результат в памяти, вытесняя самые старые записи.
+            - Рабочие ссылки дополнительно записывает в файл, если он задан.
+              Каждая запись сразу сохраняется короткой транзакцией, поэтому
+              файл кэша могут одновременно использовать несколько процессов.
+        """
+        key = normalize_url(result.url)
+        now = time.time()
+        with self._lock:
+            self._remember(key, result, now)
+            if self._db is None or not result.ok:
+                return
+            self._db.execute(
+                "INSERT OR REPLACE INTO links (url, data, checked_at) VALUES (?, ?, ?)",
+                (key, json.dumps(result._asdict(), ensure_ascii=False), now)
+            )
+            self._db.commit()
+
+    def close(self) -> None:
+        """
+        Закрывает файл кэша.
+        """
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _remember(self, key, result, now):
+        """
+        Добавляет запись в память и вытесняет давно не использованные записи.
+
+        Аргументы:
+            key (str): Нормализованная ссылка.
+            result (ProbeResult): Результат проверки.
+            now (float): Текущее время.
+        """
+        self._entries[key] = (result, now)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
@@ -1,29 +1,48 @@
 """Модуль для проверки ссылок на веб-страницах.
 
-Этот модуль содержит класс `LinkChecker`, который использует
-Selenium WebDriver для автоматизации браузера
-и проверки доступности ссылок на указанных веб-страницах.
-Результаты проверки сохраняются в Excel файл.
+Этот модуль содержит класс `LinkChecker`, который обходит страницы
+со списком новостей и проверяет доступность ссылок внутри новостей.
+Страницы загружаются через источник из модуля `pages`: обычными HTTP-запросами
+или через Selenium WebDriver для сайтов, которые строятся с помощью JavaScript.
+Источник страниц только собирает ссылки, а их проверка выполняется
+параллельно в `LinkProber`.
+Результаты проверки записываются в отчет сразу, как только найдены.
+Если задан файл состояния, новости, которые не изменились с прошлого запуска,
+не проверяются заново, пока не истечет срок годности результатов.
+Если задан файл контрольной точки, ход проверки сохраняется, и прерванный
+запуск можно продолжить.
 
 Основные функции:
 - Проверка ссылок на новостях на указанных URL-адресах.
-- Сохранение информации о неработающих ссылках в Excel файл.
+- Сохранение информации о неработающих ссылках в Excel, CSV или JSONL файл.
 
 Пример использования:
 ```python
 urls = ['https://examle.by/']
 checker = LinkChecker(urls)
-checker.check_links()
+checker.check_links(urls[0])
+checker.close()
 ```
 """
 
 import threading
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-import requests
-from utils import animate_search, print_slowly, save_data
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from urllib.parse import urlsplit
+from cache import LinkCache
+from checkpoint import Checkpoint
+from crawl_state import ArticleRecord, CrawlState, links_hash
+from discovery import SitemapDiscovery
+from driver_pool import DriverPool, chrome_options
+from logs import log_error
+from metrics import METRICS
+from pagination import discover_listing_urls, last_page_number, listing_key
+from pages import NEWS_XPATH, TITLE_XPATH, make_page_source
+from prober import LinkProber, ProbeResult
+from report import ReportWriter
+from results import BrokenLink, CheckSummary
+from urls import TRACKING_PARAMS, LinkNormalizer, SeenIndex
+from utils import animate_search, print_slowly
 
 class LinkChecker:
     """
@@ -31,31 +50,125 @@ class LinkChecker:
 
     Атрибуты:
         urls (list): Список URL-адресов для проверки.
-        data_to_save (list): Список для хранения данных о неработающих ссылках.
+        backend (str): Источник страниц: `auto`, `http` или `selenium`.
+        article_workers (int): Число новостей, которые обрабатываются одновременно.
+        listing_workers (int): Число страниц списка, которые загружаются одновременно.
+        max_listing_pages (int): Максимальный номер страницы списка; 0 — без ограничения.
+        report_formats (tuple): Форматы отчета.
         options (webdriver.ChromeOptions): Опции для настройки Chrome WebDriver.
+        pool (DriverPool): Общий для всех потоков пул браузеров.
+        cache (LinkCache): Общий для всех потоков кэш результатов проверки ссылок.
+        normalizer (LinkNormalizer): Приведение ссылок к единому виду перед проверкой.
+        seen (SeenIndex): Индекс рабочих ссылок на весь запуск.
+        prober (LinkProber): Пул для параллельной проверки ссылок.
+        state (CrawlState | None): Состояние новостей между запусками.
+        discovery (str): Способ поиска новостей: `listing`, `sitemap` или `auto`.
+        sitemaps (SitemapDiscovery | None): Поиск новостей по картам сайта и лентам.
+        checkpoint (Checkpoint | None): Хранилище хода проверки.
+        resume (bool): Продолжать ли прерванные проверки.
     """
-    def __init__(self, urls):
+    def __init__(self, urls, probe_workers=20, probe_per_host=4, probe_timeout=30,
+                 probe_connect_timeout=10, probe_retries=2, probe_host_rate=10,
+                 cache_path=None, cache_max_age=12 * 3600, backend='auto',
+                 article_workers=4, listing_workers=4, browser_workers=4, browser_max_pages=50,
+                 report_formats=('xlsx',), state_path=None, state_link_ttl=24 * 3600,
+                 discovery='listing', checkpoint_path=None, resume=False,
+                 strip_params=TRACKING_PARAMS, link_index='hash', max_listing_pages=0):
         """
         Инициализация объекта LinkChecker.
 
         Аргументы:
             urls (list): Список URL-адресов для проверки.
+            probe_workers (int): Число потоков для проверки ссылок.
+            probe_per_host (int): Число одновременных запросов к одному хосту.
+            probe_timeout (float): Таймаут ожидания ответа при проверке ссылки в секундах.
+            probe_connect_timeout (float): Таймаут установки соединения в секундах.
+            probe_retries (int): Число повторов проверки при ответах 429/5xx и таймаутах.
+            probe_host_rate (float): Максимальное число запросов в секунду к одному хосту.
+                0 отключает ограничение.
+            cache_path (str, optional): Файл SQLite для хранения проверенных ссылок
+                между запусками.
+            cache_max_age (float): Через сколько секунд ссылку из файла нужно
+                проверить заново.
+            backend (str): Источник страниц. `http` загружает HTML без браузера,
+                `selenium` использует Chrome WebDriver, `auto` использует HTTP
+                и переключается на Selenium для страниц, которые строятся через JavaScript.
+            article_workers (int): Число новостей, которые обрабатываются одновременно
+                для одной ссылки.
+            listing_workers (int): Число страниц со списком новостей, которые
+                загружаются одновременно для одной ссылки.
+            browser_workers (int): Максимальное число одновременно запущенных браузеров.
+            browser_max_pages (int): Число страниц, после которого браузер перезапускается.
+            report_formats (Iterable[str]): Форматы отчета: `xlsx`, `csv`, `jsonl`.
+            state_path (str, optional): Файл SQLite для хранения состояния новостей
+                между запусками. Если не задан, все новости проверяются заново.
+            state_link_ttl (float): Сколько секунд результаты проверки ссылок
+                неизмененной новости используются повторно.
+            discovery (str): Способ поиска новостей. `listing` обходит страницы
+                со списком новостей, `sitemap` берет новости из карт сайта и RSS/Atom
+                лент, `auto` использует карты сайта и ленты, а если новости в них
+                не найдены, обходит страницы списка.
+            checkpoint_path (str, optional): Файл SQLite для сохранения хода проверки.
+            resume (bool): Продолжить прерванную проверку из файла `checkpoint_path`.
+            strip_params (Iterable[str]): Параметры запроса, которые удаляются из ссылок
+                перед проверкой; имя с `*` на конце удаляет все параметры с таким началом.
+            link_index (str): Индекс рабочих ссылок на весь запуск: `hash` (хэши ссылок)
+                или `bloom` (фильтр Блума фиксированного размера для очень больших обходов).
+            max_listing_pages (int): Максимальный номер страницы списка, которая
+                загружается; 0 — все страницы. Если страниц больше, это записывается в лог.
         """
         self.urls = urls
-        self.data_to_save = []
-        self.options = webdriver.ChromeOptions()
-        self.options.add_argument('--disable-blink-features=AutomationControlled')
-        self.options.add_argument('--headless=new')
+        self.backend = backend
+        self.article_workers = article_workers
+        self.listing_workers = listing_workers
+        self.max_listing_pages = max_listing_pages
+        self.report_formats = tuple(report_formats)
+        self.cache = LinkCache(path=cache_path, max_age=cache_max_age)
+        self.normalizer = LinkNormalizer(strip_params)
+        self.seen = SeenIndex(link_index)
+        self.prober = LinkProber(max_workers=probe_workers,
+                                 per_host=probe_per_host,
+                                 timeout=probe_timeout,
+                                 connect_timeout=probe_connect_timeout,
+                                 retries=probe_retries,
+                                 host_rate=probe_host_rate,
+                                 cache=self.cache,
+                                 seen=self.seen)
+        self.options = chrome_options()
+        self.pool = DriverPool(size=browser_workers, options=self.options,
+                               max_pages=browser_max_pages)
+        self.state = CrawlState(state_path, link_ttl=state_link_ttl) if state_path else None
+        self.discovery = discovery
+        self.sitemaps = SitemapDiscovery(timeout=probe_timeout) if discovery != 'listing' else None
+        self.checkpoint = Checkpoint(checkpoint_path) if checkpoint_path else None
+        self.resume = resume
 
-    def set_logs(self, error: str) -> None:
+    def set_logs(self, error: str, **fields) -> None:
         """
         Записывает информацию об ошибках в файл error_logs.txt.
 
+        Запись только ставится в очередь, а в файл ее записывает фоновый поток
+        модуля `logs`, поэтому вызов не блокирует рабочие потоки.
+
         Параметры:
             error (str): Текст ошибки.
+            **fields: Дополнительные поля записи: url, article, exc, elapsed.
+        """
+        log_error(error, **fields)
+
+    def close(self) -> None:
+        """
+        Дожидается завершения всех проверок и освобождает ресурсы.
         """
-        with open('error_logs.txt', 'a', encoding='utf-8') as f:
-            f.write(f"Ошибка: {error}\n")
+        self.prober.close()
+        self.cache.close()
+        self.pool.close()
+        if self.state is not None:
+            self.state.close()
+        if self.sitemaps is not None:
+            self.sitemaps.close()
+        if self.checkpoint is not None:
+            self.checkpoint.close()
 
     def check_links(self, url):
         """
@@ -65,135 +178,490 @@ class LinkChecker:
             url(str): Строка содержащая ссылку.
         
         Описание:
-        - Инициализирует Chrome WebDriver.
-        - Проходит по каждому URL-адресу и вызывает метод _process_page для обработки страницы.
-        - Сохраняет данные о неработающих ссылках в Excel файл.
+        - Создает источник страниц выбранного типа.
+        - Вызывает метод _process_page для обхода страниц со списком новостей.
+          Новости обрабатываются параллельно в пуле из `article_workers` потоков.
+        - Записывает неработающие ссылки в отчет сразу, как только они найдены.
+        - Если задан файл контрольной точки, сохраняет ход проверки, а при `resume`
+          продолжает прерванную проверку: записывает в отчет найденные ранее
+          неработающие ссылки и обрабатывает только оставшиеся страницы и новости.
+
+        Возвращает:
+            CheckSummary: Итоги проверки этого URL-адреса. Если первая страница
+                списка не загрузилась, новости не найдены или произошла ошибка,
+                у итогов установлен признак `failed`.
+                Все данные проверки хранятся в локальных объектах вызова,
+                поэтому метод можно вызывать одновременно из нескольких потоков.
         """
 
+        summary = CheckSummary(url)
         try:
-            with webdriver.Chrome(options=self.options) as browser:
-                self.data_to_save = []
-                browser.get(url)
-                self._process_page(browser)
-
-                if self.data_to_save:
-                    save_data(self.data_to_save, url)
-                else:
-                    self.set_logs("Нет данных для сохранения.")
-                    print_slowly("Нет данных для сохранения.")
+            with ReportWriter(url, self.report_formats) as report, \
+                    make_page_source(self.backend, self.pool) as source, \
+                    ThreadPoolExecutor(max_workers=self.article_workers,
+                                       thread_name_prefix='article') as articles:
+                progress = None
+                if self.checkpoint is not None:
+                    progress = self.checkpoint.start(url, resume=self.resume)
+                collector = _Collector(self, report, url, progress)
+                self._process_page(source, url, articles, collector)
+                collector.drain(block=True)
+                summary = collector.summary(url)
+            if self.checkpoint is not None:
+                self.checkpoint.finish(url)
+
+            if not summary.broken:
+                self.set_logs("Нет данных для сохранения.")
+                print_slowly("Нет данных для сохранения.")
         except Exception as e: # pylint: disable=broad-exception-caught
-            self.set_logs(f"Произошла ошибка: {e}.")
+            self.set_logs(f"Произошла ошибка: {e}.", url=url, exc=e)
             print_slowly(f"Произошла ошибка: {e}.\nДанные об ошибке в файле error_logs.txt.")
+            summary = summary._replace(failed=True)
+        return summary
 
-    def _process_page(self, browser):
+    def _process_page(self, source, url, articles, collector):
         """
-        Обрабатывает текущую страницу, проверяя ссылки на новостях.
+        Обходит страницы со списком новостей, проверяя ссылки на новостях.
 
         Аргументы:
-            browser (webdriver.Chrome): Экземпляр Chrome WebDriver.
+            source (PageSource): Источник страниц.
+            url (str): Адрес первой страницы со списком новостей.
+            articles (ThreadPoolExecutor): Пул потоков для обработки новостей.
+            collector (_Collector): Сборщик результатов этого вызова check_links.
             
         Описание:
-            - Находит все ссылки на новости на текущей странице.
-            - Для каждой новости вызывает метод _process_news для проверки ссылок внутри новости.
-            - Проверяет наличие следующей страницы и переходит на нее, если она существует.
+            - Если включен поиск по картам сайта и лентам, берет новости из них
+              и не загружает страницы списка (в режиме `auto` — только если
+              новости найдены).
+            - Загружает первую страницу и по блоку .pagination находит адреса
+              всех страниц списка (модуль `pagination`), удаляя повторы.
+            - Если задан `max_listing_pages`, не загружает страницы с большим номером
+              и записывает в лог, что страниц больше.
+            - Загружает страницы списка параллельно в пуле из `listing_workers` потоков;
+              ссылки, найденные на загруженных страницах, тоже ставятся в очередь.
+            - Ставит каждую новость в очередь пула `articles`, где метод _process_news
+              проверяет ссылки внутри новости.
+            - После каждой страницы записывает в отчет уже найденные неработающие ссылки.
+            - При продолжении прерванной проверки сначала ставит в очередь
+              необработанные новости и страницы списка из контрольной точки
+              и пропускает уже загруженные страницы списка.
         """
         stop_event = threading.Event()
         animation_thread = threading.Thread(target=animate_search, args=(stop_event,))
         animation_thread.start()
 
-        while True:
-            try:
-                news_list = WebDriverWait(browser, 10).until(
-                    EC.presence_of_all_elements_located((By.XPATH, "//div[@class='image']/a"))
-                )
-            except Exception as e:  # pylint: disable=broad-exception-caught
-                self.set_logs(f"Новости не найдены: {e}")
-                stop_event.set()
-                animation_thread.join()
-                print_slowly("Новости не найдены, переход к следующей ссылке\n")
-                break
-            
-            for n_l in news_list:
-                try:
-                    self._process_news(browser, n_l)
-                except Exception as e2: # pylint: disable=broad-exception-caught
-                    self.set_logs(f"Ошибка при обработке новости: {e2}\n{n_l.text}")
+        progress = collector.progress
+        visited = set(progress.listings_done) if progress else set()
+        pending = {}
+        truncated = 0
+        try:
+            for href in progress.articles_pending if progress else ():
+                if href not in collector.seen_news:
+                    collector.add_article(href, articles.submit(self._process_news, source, href))
+
+            if self.sitemaps is not None:
+                found = self._discover_articles(source, url, articles, collector)
+                if found or self.discovery == 'sitemap':
+                    collector.failed = not found and not collector.seen_news
+                    print_slowly(f"Новостей найдено в картах сайта и лентах: {found}, "
+                                 f"переход к следующей ссылке\n")
+                    return
+
+            with ThreadPoolExecutor(max_workers=self.listing_workers,
+                                    thread_name_prefix='listing') as listings:
+                def schedule(page_url):
+                    key = listing_key(page_url)
+                    if key not in visited:
+                        visited.add(key)
+                        collector.listing_queued(key, page_url)
+                        pending[listings.submit(self._load_listing, source, page_url)] = page_url
+
+                for _, page_url in progress.listings_pending if progress else ():
+                    schedule(page_url)
+                schedule(url)
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        page_url = pending.pop(future)
+                        try:
+                            page, news_list = future.result()
+                        except Exception as e:  # pylint: disable=broad-exception-caught
+                            self.set_logs(f"Новости не найдены: {e}", url=page_url, exc=e)
+                            if page_url == url:
+                                collector.failed = True
+                                print_slowly("Новости не найдены, переход к следующей ссылке\n")
+                            continue
+
+                        for href in news_list:
+                            if href not in collector.seen_news:
+                                collector.add_article(
+                                    href, articles.submit(self._process_news, source, href)
+                                )
+                        last = last_page_number(page)
+                        limit = self.max_listing_pages
+                        if limit and last > max(truncated, limit):
+                            truncated = last
+                            self.set_logs(f"Страниц со списком новостей {last}, загружаются "
+                                          f"только первые {limit}", url=page_url)
+                        for listing_url in discover_listing_urls(page, limit):
+                            schedule(listing_url)
+                        collector.listing_done(listing_key(page_url))
+                    collector.drain()
+            print_slowly(f"Обработано страниц со списком новостей: {len(visited)}, "
+                         f"переход к следующей ссылке\n")
+        finally:
+            stop_event.set()
+            animation_thread.join()
+
+    def _discover_articles(self, source, url, articles, collector):
+        """
+        Ставит в очередь новости, найденные в картах сайта и RSS/Atom лентах.
+
+        Аргументы:
+            source (PageSource): Источник страниц.
+            url (str): Адрес раздела новостей.
+            articles (ThreadPoolExecutor): Пул потоков для обработки новостей.
+            collector (_Collector): Сборщик результатов этого вызова check_links.
+
+        Возвращает:
+            int: Число найденных новостей.
+        """
+        found = 0
+        try:
+            for href in self.sitemaps.articles(url):
+                if href in collector.seen_news:
                     continue
+                collector.add_article(href, articles.submit(self._process_news, source, href))
+                found += 1
+                if found % 100 == 0:
+                    collector.drain()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            self.set_logs(f"Ошибка при чтении карты сайта: {e}", url=url, exc=e)
+        return found
 
-            try:
-                pagination = WebDriverWait(browser, 10).until(
-                    EC.presence_of_element_located((By.CLASS_NAME, "pagination"))
-                )
-                next_page_link = pagination.find_elements(By.TAG_NAME, "a")
-                for i in next_page_link:
-                    try:
-                        if i.text.isdigit():
-                            i.click()
-                        WebDriverWait(browser, 10).until(EC.staleness_of(news_list[0]))
-                    except Exception as e: # pylint: disable=broad-exception-caught
-                        self.set_logs(f"Активных страниц нет: {e}")
-                else:
-                    stop_event.set()
-                    animation_thread.join()
-                    print_slowly("Следующая страница не найдена, переход к следующей ссылке\n")
-                    break
-            except Exception as e: # pylint: disable=broad-exception-caught
-                stop_event.set()
-                animation_thread.join()
-                self.set_logs(f"Ошибка: {e}")
-                break
+    def _load_listing(self, source, page_url):
+        """
+        Загружает страницу со списком новостей.
+
+        Аргументы:
+            source (PageSource): Источник страниц.
+            page_url (str): Адрес страницы списка.
 
-    def _process_news(self, browser, news_link):
+        Возвращает:
+            tuple: Пара (Page, список ссылок на новости).
+
+        Исключения:
+            ValueError: Если на странице нет ссылок на новости.
+        """
+        with METRICS.timer('listing_load', site=urlsplit(page_url).netloc):
+            page = source.fetch(page_url, wait_for=NEWS_XPATH)
+        news_list = page.news_links()
+        if not news_list:
+            raise ValueError(f"нет элементов {NEWS_XPATH} на {page_url}")
+        return page, news_list
+
+    def _process_news(self, source, href):
         """
         Обрабатывает отдельную новость, проверяя ссылки внутри нее.
 
         Аргументы:
-            browser (webdriver.Chrome): Экземпляр Chrome WebDriver.
-            news_link (WebElement): Элемент ссылки на новость.
+            source (PageSource): Источник страниц.
+            href (str): Ссылка на новость.
 
         Описание:
-            - Открывает ссылку на новость в новой вкладке.
-            - Находит все ссылки внутри новости и проверяет их доступность.
-            - Сохраняет информацию о неработающих ссылках.
+            - Загружает страницу новости. Если новость уже обходили, запрос
+              отправляется с заголовками If-None-Match и If-Modified-Since.
+            - Находит все ссылки внутри новости, приводит их к единому виду,
+              пропускает ссылки mailto:, tel:, javascript: и на фрагменты страницы
+              и ставит остальные в очередь на проверку. Ссылка в едином виде служит
+              только ключом проверки, а в отчет попадает ссылка в исходном виде.
+            - Ссылка, которую нельзя разобрать (например, `http://[::1`), не
+              проверяется и сразу записывается в отчет как возможно некорректная;
+              остальные ссылки новости проверяются как обычно.
+            - Если новость не изменилась (ответ 304 или тот же набор ссылок)
+              и результаты прошлой проверки еще актуальны, использует их
+              вместо повторной проверки ссылок. Повторно используются только
+              окончательные результаты; ссылки с временными ошибками (таймаут,
+              ошибка соединения, 429/5xx, недоступный хост) проверяются заново.
+
+        Возвращает:
+            tuple: Пара (состояние новости для сохранения или None, список кортежей
+                (заголовок новости, ссылка на новость, текст ссылки, ссылка в едином
+                виде, ссылка в исходном виде, Future с результатом проверки ссылки)).
+        """
+        record = self.state.get(href) if self.state is not None else None
+        validators = (record.etag, record.last_modified) if record is not None else None
+        with METRICS.timer('article_open', site=urlsplit(href).netloc):
+            page = source.fetch(href, wait_for=TITLE_XPATH, validators=validators)
+        if page is None:
+            h1_link_list, raw_links, base_url = record.title, record.links, href
+            etag, last_modified = record.etag, record.last_modified
+        else:
+            h1_link_list, raw_links, base_url = page.title(), page.content_links(), page.url
+            etag, last_modified = page.etag, page.last_modified
+        links, invalid = [], {}
+        for text, link in raw_links:
+            try:
+                key = self.normalizer.normalize(link, base_url)
+            except ValueError as e:
+                key = link
+                invalid[link] = e
+            if key is not None:
+                links.append((text, link, key))
+        links = tuple(links)
+        digest = links_hash((text, key) for text, _, key in links)
+
+        if (record is not None and record.links_hash == digest
+                and self.state.is_fresh(record)):
+            futures = {}
+            for link, result in record.verdicts.items():
+                if not result.settled:
+                    continue
+                futures[link] = Future()
+                futures[link].set_result(result)
+            draft = None
+            if page is not None or len(futures) < len(record.verdicts):
+                draft = record._replace(title=h1_link_list, etag=etag,
+                                        last_modified=last_modified)
+        else:
+            futures = {}
+            draft = ArticleRecord(href, h1_link_list, etag, last_modified, digest,
+                                  tuple((text, link) for text, link, _ in links),
+                                  {}, 0.0) if self.state is not None else None
+
+        items = []
+        for l_l_text, link, href_checklink in links:
+            if href_checklink in invalid:
+                futures[href_checklink] = Future()
+                futures[href_checklink].set_result(ProbeResult(
+                    href_checklink, error=str(invalid[href_checklink]),
+                    error_type=type(invalid[href_checklink]).__name__))
+            elif href_checklink not in futures:
+                futures[href_checklink] = self.prober.submit(href_checklink)
+            items.append((h1_link_list, href, l_l_text, href_checklink, link,
+                          futures[href_checklink]))
+        return draft, items
+
+
+class _Collector:
+    """
+    Сборщик результатов одного вызова `LinkChecker.check_links`.
+
+    Работает только в потоке, который вызвал check_links, поэтому не использует
+    блокировок: потоки новостей и проверки ссылок лишь завершают свои Future,
+    а сборщик забирает готовые результаты и записывает неработающие ссылки в отчет.
+
+    Атрибуты:
+        seen_news (set): Ссылки на новости, уже поставленные в очередь.
+        failed (bool): True, если новости не удалось найти.
+        progress (Progress | None): Ход прерванной проверки, которая продолжается.
+    """
+    def __init__(self, checker, report, run=None, progress=None):
+        """
+        Инициализация объекта _Collector.
+
+        Аргументы:
+            checker (LinkChecker): Объект проверки, используется для записи логов.
+            report (ReportWriter): Отчет, в который записываются неработающие ссылки.
+            run (str, optional): Проверяемая ссылка, по которой сохраняется ход проверки.
+            progress (Progress, optional): Ход прерванной проверки. Найденные ранее
+                неработающие ссылки сразу записываются в отчет, а обработанные
+                новости не обрабатываются повторно.
         """
-        href = news_link.get_attribute('href')
-        browser.execute_script(f"window.open('{href}', '_blank');")
-        window_handles = browser.window_handles
-        browser.switch_to.window(window_handles[-1])
+        self.checker = checker
+        self.report = report
+        self.run = run
+        self.progress = progress
+        self.seen_news = set()
+        self.failed = False
+        self._articles = {}
+        self._links = []
+        self._states = []
+        self._remaining = {}
+        self._checked = 0
+        if progress is not None:
+            self.seen_news.update(progress.articles_done)
+            for row in progress.rows:
+                self.report.write(row)
+
+    @property
+    def _checkpoint(self):
+        """Возвращает хранилище хода проверки или None."""
+        return self.checker.checkpoint if self.run is not None else None
 
-        # h1_link_list = WebDriverWait(browser, 10).until(
-        #     EC.presence_of_element_located((By.CLASS_NAME, "rt1"))
-        # ).text
-        h1_link_list = WebDriverWait(browser, 10).until(
-            EC.presence_of_element_located((By.TAG_NAME, "h1"))
-        ).text
+    def listing_queued(self, key, url) -> None:
+        """
+        Сохраняет страницу списка, поставленную в очередь.
 
-        link_list = browser.find_element(By.ID, "content")
-        link_list = link_list.find_elements(By.TAG_NAME, "a")
+        Аргументы:
+            key (str): Ключ страницы списка.
+            url (str): Адрес страницы списка.
+        """
+        if self._checkpoint is not None:
+            self._checkpoint.listing_queued(self.run, key, url)
 
-        for l_l in link_list:
-            l_l_text = l_l.text
-            href_checklink = l_l.get_attribute('href')
+    def listing_done(self, key) -> None:
+        """
+        Сохраняет отметку о загруженной странице списка.
 
+        Аргументы:
+            key (str): Ключ страницы списка.
+        """
+        if self._checkpoint is not None:
+            self._checkpoint.listing_done(self.run, key)
+
+    def add_article(self, href, future) -> None:
+        """
+        Запоминает новость, поставленную в очередь на обработку.
+
+        Аргументы:
+            href (str): Ссылка на новость.
+            future (Future): Future с результатом _process_news.
+        """
+        self.seen_news.add(href)
+        self._articles[href] = future
+        if self._checkpoint is not None:
+            self._checkpoint.article_queued(self.run, href)
+
+    def drain(self, block=False) -> None:
+        """
+        Забирает готовые результаты и записывает неработающие ссылки в отчет.
+
+        Аргументы:
+            block (bool): Если True, дожидается всех новостей и всех проверок ссылок.
+        """
+        for href, future in list(self._articles.items()):
+            if not block and not future.done():
+                continue
+            del self._articles[href]
             try:
-                response = requests.get(href_checklink, timeout=30)
-                if response.status_code != 200:
-                    self.data_to_save.append({
-                        "Основная статья": h1_link_list,
-                        "Ссылка на основную статью": href,
-                        "Ошибка": response.status_code,
-                        "Текст ссылки в основной статье": l_l_text,
-                        "Неработающая ссылка": href_checklink
-                    })
+                draft, items = future.result()
             except Exception as e: # pylint: disable=broad-exception-caught
-                self.data_to_save.append({
-                    "Основная статья": h1_link_list,
-                    "Ссылка на основную статью": href,
-                    "Ошибка": "Возможно некорректная ссылка",
-                    "Текст ссылки в основной статье": l_l_text,
-                    "Неработающая ссылка": href_checklink
-                })
-                self.set_logs(f"Возможно некорректная ссылка - {e}")
-
-        browser.close()
-        browser.switch_to.window(window_handles[0])
+                self.checker.set_logs(f"Ошибка при обработке новости: {e}",
+                                      article=href, exc=e)
+                continue
+            self._links.extend(items)
+            self._remaining[href] = len(items)
+            if not items:
+                self._article_checked(href)
+            if draft is not None:
+                self._states.append((draft, {item[3]: item[-1] for item in items}))
+
+        remaining = []
+        for item in self._links:
+            if block or item[-1].done():
+                self._record(*item)
+            else:
+                remaining.append(item)
+        self._links = remaining
+
+        pending = []
+        for draft, futures in self._states:
+            if block or all(future.done() for future in futures.values()):
+                self._save_state(draft, futures)
+            else:
+                pending.append((draft, futures))
+        self._states = pending
+        self.report.flush()
+
+    def summary(self, url):
+        """
+        Возвращает итоги проверки.
+
+        Аргументы:
+            url (str): Проверенный URL-адрес.
+
+        Возвращает:
+            CheckSummary: Число новостей, проверенных и неработающих ссылок, файлы отчета
+                и признак неудачной проверки.
+        """
+        return CheckSummary(url, len(self.seen_news), self._checked,
+                            self.report.rows, tuple(self.report.filenames), self.failed)
+
+    def _save_state(self, draft, futures):
+        """
+        Сохраняет состояние новости после проверки всех ее ссылок.
+
+        Аргументы:
+            draft (ArticleRecord): Состояние новости без результатов проверки.
+            futures (dict): Future с результатами проверки по ссылке.
+
+        Описание:
+            Если результаты были взяты из прошлого запуска, время проверки
+            не меняется, чтобы они не продлевались бесконечно.
+        """
+        try:
+            verdicts = {link: future.result() for link, future in futures.items()}
+            checked_at = draft.checked_at or time.time()
+            self.checker.state.put(draft._replace(verdicts=verdicts, checked_at=checked_at))
+        except Exception as e: # pylint: disable=broad-exception-caught
+            self.checker.set_logs(f"Не удалось сохранить состояние новости: {e}",
+                                  article=draft.href, exc=e)
+
+    def _record(self, title, article_url, text, link, href, future):
+        """
+        Записывает в отчет ссылку, если ее проверка завершилась неудачно.
+
+        Аргументы:
+            title (str): Заголовок новости.
+            article_url (str): Ссылка на новость.
+            text (str): Текст ссылки в новости.
+            link (str): Проверенная ссылка в едином виде.
+            href (str): Ссылка в исходном виде, как она указана в новости.
+            future (Future): Future с результатом проверки (`ProbeResult`).
+
+        Описание:
+            Ошибка при получении результата или записи отчета записывается в лог
+            и не прерывает проверку остальных ссылок.
+        """
+        try:
+            result = future.result()
+            self._checked += 1
+            if not result.ok:
+                self._write(title, article_url, text, link, href, result)
+        except Exception as e: # pylint: disable=broad-exception-caught
+            self.checker.set_logs(f"Ошибка при проверке ссылки: {e}",
+                                  url=href, article=article_url, exc=e)
+        self._remaining[article_url] -= 1
+        if not self._remaining[article_url]:
+            self._article_checked(article_url)
+
+    def _article_checked(self, href) -> None:
+        """
+        Отмечает новость, все ссылки которой проверены и записаны в отчет.
+
+        Аргументы:
+            href (str): Ссылка на новость.
+        """
+        self._remaining.pop(href, None)
+        if self._checkpoint is not None:
+            self._checkpoint.article_done(self.run, href)
+
+    def _write(self, title, article_url, text, link, href, result):
+        """
+        Записывает неработающую ссылку в отчет и в контрольную точку.
+
+        Аргументы:
+            title (str): Заголовок новости.
+            article_url (str): Ссылка на новость.
+            text (str): Текст ссылки в новости.
+            link (str): Проверенная ссылка в едином виде.
+            href (str): Ссылка в исходном виде, которая записывается в отчет,
+                чтобы ее можно было найти в тексте новости.
+            result (ProbeResult): Результат проверки.
+        """
+        if result.error is not None:
+            error = result.reason
+            self.checker.set_logs(f"{error} - {result.error}",
+                                  url=href, article=article_url,
+                                  exc=result.error_type, elapsed=result.elapsed)
+        elif result.status == 429:
+            error = result.reason
+        else:
+            error = result.status
+        row = BrokenLink(title, article_url, error, text, href,
+                         result.final_url or "", result.redirects,
+                         self.checker.normalizer.kind(link, article_url))
+        self.report.write(row)
+        if self._checkpoint is not None:
+            self._checkpoint.add_row(self.run, row)
@@ -0,0 +1,224 @@
+"""Модуль для сохранения хода проверки и продолжения прерванного запуска.
+
+Этот модуль содержит класс `Checkpoint`, который во время проверки записывает
+в файл SQLite очередь страниц со списком новостей, очередь и обработанные
+новости, а также уже найденные неработающие ссылки. Если программа аварийно
+завершилась (например, упал Chrome или перезагрузился компьютер), запуск
+с параметром `--resume` продолжает проверку с того места, где она остановилась,
+и не теряет найденные ранее неработающие ссылки.
+
+Основные функции:
+- `Checkpoint.start`: Начало нового запуска или загрузка сохраненного хода проверки.
+- `Checkpoint.listing_queued`, `Checkpoint.listing_done`: Очередь страниц списка.
+- `Checkpoint.article_queued`, `Checkpoint.article_done`: Очередь новостей.
+- `Checkpoint.add_row`: Сохранение найденной неработающей ссылки.
+- `Checkpoint.finish`: Удаление сохраненного хода успешно завершенной проверки.
+
+Пример использования:
+```python
+checkpoint = Checkpoint('checkpoint.sqlite3')
+progress = checkpoint.start('https://example.by/news/', resume=True)
+checkpoint.article_queued('https://example.by/news/', 'https://example.by/news/1/')
+checkpoint.finish('https://example.by/news/')
+checkpoint.close()
+```
+"""
+
+import json
+import threading
+import time
+from typing import NamedTuple
+from results import BrokenLink
+from utils import connect_database
+
+
+class Progress(NamedTuple):
+    """
+    Сохраненный ход проверки одной ссылки.
+
+    Атрибуты:
+        listings_done (set): Ключи уже загруженных страниц списка.
+        listings_pending (list): Пары (ключ, адрес) страниц списка, которые стояли в очереди.
+        articles_done (set): Ссылки на новости, все ссылки которых уже проверены.
+        articles_pending (list): Ссылки на новости, которые стояли в очереди.
+        rows (list): Неработающие ссылки (`BrokenLink`) из обработанных новостей.
+    """
+    listings_done: set
+    listings_pending: list
+    articles_done: set
+    articles_pending: list
+    rows: list
+
+
+class Checkpoint:
+    """
+    Потокобезопасное хранилище хода проверки в SQLite.
+
+    Каждое изменение сохраняется короткой транзакцией, поэтому после сбоя
+    теряется не больше одного изменения, а файл могут одновременно
+    использовать несколько процессов.
+    """
+    def __init__(self, path):
+        """
+        Инициализация объекта Checkpoint.
+
+        Аргументы:
+            path (str): Путь к файлу SQLite.
+        """
+        self._lock = threading.Lock()
+        self._db = connect_database(path)
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS runs (run TEXT PRIMARY KEY, started_at REAL NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS listings (run TEXT NOT NULL, key TEXT NOT NULL, "
+            "url TEXT NOT NULL, done INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (run, key));"
+            "CREATE TABLE IF NOT EXISTS articles (run TEXT NOT NULL, href TEXT NOT NULL, "
+            "done INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (run, href));"
+            "CREATE TABLE IF NOT EXISTS rows (run TEXT NOT NULL, href TEXT NOT NULL, "
+            "data TEXT NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS rows_article ON rows (run, href);"
+        )
+        self._db.commit()
+
+    def start(self, run, resume=False):
+        """
+        Начинает проверку ссылки.
+
+        Аргументы:
+            run (str): Проверяемая ссылка, по которой сохраняется ход проверки.
+            resume (bool): Продолжить прерванную проверку, если она есть.
+
+        Описание:
+            - Без `resume` или если прерванной проверки нет, удаляет старые данные
+              и начинает запуск заново.
+            - С `resume` удаляет неработающие ссылки из необработанных до конца новостей,
+              потому что эти новости будут проверены заново.
+
+        Возвращает:
+            Progress | None: Сохраненный ход проверки или None для нового запуска.
+        """
+        with self._lock:
+            exists = self._db.execute("SELECT 1 FROM runs WHERE run = ?", (run,)).fetchone()
+            if not resume or not exists:
+                self._clear(run)
+                self._db.execute("INSERT INTO runs (run, started_at) VALUES (?, ?)",
+                                 (run, time.time()))
+                self._db.commit()
+                return None
+
+            self._db.execute(
+                "DELETE FROM rows WHERE run = ? AND href NOT IN "
+                "(SELECT href FROM articles WHERE run = ? AND done = 1)", (run, run)
+            )
+            self._db.commit()
+            listings = self._db.execute(
+                "SELECT key, url, done FROM listings WHERE run = ?", (run,)
+            ).fetchall()
+            articles = self._db.execute(
+                "SELECT href, done FROM articles WHERE run = ? ORDER BY rowid", (run,)
+            ).fetchall()
+            rows = self._db.execute(
+                "SELECT data FROM rows WHERE run = ? ORDER BY rowid", (run,)
+            ).fetchall()
+        return Progress(
+            {key for key, _, done in listings if done},
+            [(key, url) for key, url, done in listings if not done],
+            {href for href, done in articles if done},
+            [href for href, done in articles if not done],
+            [row._replace(redirects=tuple(row.redirects)) for row in
+             (BrokenLink(*json.loads(data)) for data, in rows)],
+        )
+
+    def listing_queued(self, run, key, url) -> None:
+        """
+        Запоминает страницу списка, поставленную в очередь.
+
+        Аргументы:
+            run (str): Проверяемая ссылка.
+            key (str): Ключ страницы списка.
+            url (str): Адрес страницы списка.
+        """
+        self._execute("INSERT OR IGNORE INTO listings (run, key, url) VALUES (?, ?, ?)",
+                      (run, key, url))
+
+    def listing_done(self, run, key) -> None:
+        """
+        Отмечает страницу списка как загруженную.
+
+        Аргументы:
+            run (str): Проверяемая ссылка.
+            key (str): Ключ страницы списка.
+        """
+        self._execute("UPDATE listings SET done = 1 WHERE run = ? AND key = ?", (run, key))
+
+    def article_queued(self, run, href) -> None:
+        """
+        Запоминает новость, поставленную в очередь.
+
+        Аргументы:
+            run (str): Проверяемая ссылка.
+            href (str): Ссылка на новость.
+        """
+        self._execute("INSERT OR IGNORE INTO articles (run, href) VALUES (?, ?)", (run, href))
+
+    def article_done(self, run, href) -> None:
+        """
+        Отмечает новость, все ссылки которой проверены.
+
+        Аргументы:
+            run (str): Проверяемая ссылка.
+            href (str): Ссылка на новость.
+        """
+        self._execute("UPDATE articles SET done = 1 WHERE run = ? AND href = ?", (run, href))
+
+    def add_row(self, run, row) -> None:
+        """
+        Сохраняет найденную неработающую ссылку.
+
+        Аргументы:
+            run (str): Проверяемая ссылка.
+            row (BrokenLink): Неработающая ссылка.
+        """
+        self._execute("INSERT INTO rows (run, href, data) VALUES (?, ?, ?)",
+                      (run, row.article_url, json.dumps(list(row), ensure_ascii=False)))
+
+    def finish(self, run) -> None:
+        """
+        Удаляет сохраненный ход проверки, которая завершилась без ошибок.
+
+        Аргументы:
+            run (str): Проверяемая ссылка.
+        """
+        with self._lock:
+            self._clear(run)
+            self._db.commit()
+
+    def close(self) -> None:
+        """
+        Закрывает файл.
+        """
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _clear(self, run) -> None:
+        """
+        Удаляет все данные запуска. Вызывается под блокировкой.
+
+        Аргументы:
+            run (str): Проверяемая ссылка.
+        """
+        for table in ('runs', 'listings', 'articles', 'rows'):
+            self._db.execute(f"DELETE FROM {table} WHERE run = ?", (run,))
+
+    def _execute(self, sql, params) -> None:
+        """
+        Выполняет изменение и сразу сохраняет его короткой транзакцией.
+
+        Аргументы:
+            sql (str): Запрос SQL.
+            params (tuple): Параметры запроса.
+        """
+        with self._lock:
+            self._db.execute(sql, params)
+            self._db.commit()
@@ -0,0 +1,155 @@
+"""Модуль для хранения состояния обхода новостей между запусками.
+
+Этот модуль содержит класс `CrawlState`, который для каждой новости хранит
+заголовки ETag и Last-Modified, хэш набора ссылок из блока #content
+и результаты последней проверки каждой ссылки. С его помощью следующий запуск
+загружает новость условным запросом и не проверяет заново ссылки новостей,
+которые не изменились, пока не истечет срок годности результатов.
+
+Пример использования:
+```python
+state = CrawlState('crawl_state.sqlite3', link_ttl=24 * 3600)
+record = state.get('https://example.by/news/1/')
+state.put(record)
+state.close()
+```
+"""
+
+import hashlib
+import json
+import threading
+import time
+from typing import NamedTuple, Optional
+from prober import ProbeResult
+from utils import connect_database
+
+
+class ArticleRecord(NamedTuple):
+    """
+    Сохраненное состояние одной новости.
+
+    Атрибуты:
+        href (str): Ссылка на новость.
+        title (str): Заголовок новости.
+        etag (str | None): Заголовок ETag последнего ответа сервера.
+        last_modified (str | None): Заголовок Last-Modified последнего ответа сервера.
+        links_hash (str): Хэш набора ссылок из блока #content в едином виде.
+        links (tuple): Пары (текст ссылки, ссылка в исходном виде).
+        verdicts (dict): Результаты проверки (`ProbeResult`) по ссылке.
+        checked_at (float): Время последней проверки ссылок.
+    """
+    href: str
+    title: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    links_hash: str
+    links: tuple
+    verdicts: dict
+    checked_at: float
+
+
+def links_hash(links) -> str:
+    """
+    Вычисляет хэш набора ссылок новости.
+
+    Аргументы:
+        links (Iterable[tuple]): Пары (текст ссылки, ссылка).
+
+    Возвращает:
+        str: Хэш SHA-1 в шестнадцатеричном виде.
+    """
+    digest = hashlib.sha1()
+    for text, href in links:
+        digest.update(f"{text}\t{href}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+class CrawlState:
+    """
+    Потокобезопасное хранилище состояния новостей в SQLite.
+
+    Атрибуты:
+        link_ttl (float): Сколько секунд результаты проверки ссылок
+            неизмененной новости считаются актуальными.
+    """
+    def __init__(self, path, link_ttl=24 * 3600):
+        """
+        Инициализация объекта CrawlState.
+
+        Аргументы:
+            path (str): Путь к файлу SQLite.
+            link_ttl (float): Сколько секунд результаты проверки ссылок
+                неизмененной новости считаются актуальными.
+        """
+        self.link_ttl = link_ttl
+        self._lock = threading.Lock()
+        self._db = connect_database(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS articles ("
+            "href TEXT PRIMARY KEY, title TEXT NOT NULL, etag TEXT, last_modified TEXT, "
+            "links_hash TEXT NOT NULL, links TEXT NOT NULL, verdicts TEXT NOT NULL, "
+            "checked_at REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    def get(self, href):
+        """
+        Возвращает сохраненное состояние новости.
+
+        Аргументы:
+            href (str): Ссылка на новость.
+
+        Возвращает:
+            ArticleRecord | None: Состояние новости или None, если ее еще не обходили.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT href, title, etag, last_modified, links_hash, links, verdicts, "
+                "checked_at FROM articles WHERE href = ?", (href,)
+            ).fetchone()
+        if row is None:
+            return None
+        href, title, etag, last_modified, digest, links, verdicts, checked_at = row
+        verdicts = {
+            url: ProbeResult(**{**data, 'redirects': tuple(data.get('redirects', ()))})
+            for url, data in json.loads(verdicts).items()
+        }
+        return ArticleRecord(href, title, etag, last_modified, digest,
+                             tuple(tuple(link) for link in json.loads(links)),
+                             verdicts, checked_at)
+
+    def is_fresh(self, record) -> bool:
+        """
+        Проверяет, что результаты проверки ссылок новости еще актуальны.
+
+        Аргументы:
+            record (ArticleRecord): Состояние новости.
+        """
+        return time.time() - record.checked_at < self.link_ttl
+
+    def put(self, record) -> None:
+        """
+        Сохраняет состояние новости короткой транзакцией.
+
+        Аргументы:
+            record (ArticleRecord): Состояние новости.
+        """
+        verdicts = {url: result._asdict() for url, result in record.verdicts.items()}
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO articles (href, title, etag, last_modified, "
+                "links_hash, links, verdicts, checked_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (record.href, record.title, record.etag, record.last_modified,
+                 record.links_hash, json.dumps(record.links, ensure_ascii=False),
+                 json.dumps(verdicts, ensure_ascii=False), record.checked_at)
+            )
+            self._db.commit()
+
+    def close(self) -> None:
+        """
+        Закрывает файл.
+        """
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
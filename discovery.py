@@ -0,0 +1,217 @@
+"""Модуль для поиска новостей по картам сайта и RSS-лентам.
+
+Этот модуль содержит класс `SitemapDiscovery`, который находит новости
+без загрузки страниц со списком новостей: по файлам sitemap.xml
+(адреса берутся из robots.txt и /sitemap.xml) и по RSS/Atom лентам,
+указанным в заголовке введенной страницы. Файлы читаются потоково
+инкрементальным XML-парсером, поэтому даже огромные карты сайта
+не загружаются в память целиком.
+
+Основные функции:
+- Чтение карт сайта, в том числе индексов карт сайта и сжатых файлов .xml.gz.
+- Чтение лент RSS и Atom.
+- Отбор только новостей с тем же началом пути, что у введенной ссылки.
+
+Пример использования:
+```python
+with SitemapDiscovery(timeout=30) as discovery:
+    for href in discovery.articles('https://example.by/news/'):
+        print(href)
+```
+"""
+
+import zlib
+from urllib.parse import urljoin, urlsplit
+import requests
+from lxml import etree
+from metrics import METRICS
+from pages import Page, header_encoding
+from pagination import page_number
+from utils import normalize_url
+
+
+DISCOVERY_MODES = ('listing', 'sitemap', 'auto')
+CHUNK_SIZE = 64 * 1024
+GZIP_MAGIC = b'\x1f\x8b'
+SITEMAP_NAMESPACES = ('', 'http://www.sitemaps.org/schemas/sitemap/0.9')
+
+
+def _local_name(tag) -> str:
+    """
+    Возвращает имя тега без пространства имен.
+
+    Аргументы:
+        tag (str): Имя тега в виде `{namespace}name` или `name`.
+    """
+    return tag.rsplit('}', 1)[-1] if isinstance(tag, str) else ''
+
+
+def _namespace(tag) -> str:
+    """
+    Возвращает пространство имен тега или пустую строку.
+
+    Аргументы:
+        tag (str): Имя тега в виде `{namespace}name` или `name`.
+    """
+    return tag[1:].split('}', 1)[0] if isinstance(tag, str) and tag.startswith('{') else ''
+
+
+class SitemapDiscovery:
+    """
+    Поиск новостей по картам сайта и RSS/Atom лентам.
+
+    Атрибуты:
+        timeout (float): Таймаут загрузки одного файла в секундах.
+        max_depth (int): Максимальная глубина вложенности индексов карт сайта.
+        session (requests.Session): Сессия с keep-alive соединениями.
+    """
+    def __init__(self, timeout=30, max_depth=3):
+        """
+        Инициализация объекта SitemapDiscovery.
+
+        Аргументы:
+            timeout (float): Таймаут загрузки одного файла в секундах.
+            max_depth (int): Максимальная глубина вложенности индексов карт сайта.
+        """
+        self.timeout = timeout
+        self.max_depth = max_depth
+        self.session = requests.Session()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        """
+        Закрывает HTTP-сессию.
+        """
+        self.session.close()
+
+    def articles(self, url):
+        """
+        Находит новости раздела по картам сайта и лентам.
+
+        Аргументы:
+            url (str): Адрес раздела новостей, например https://example.by/news/.
+
+        Описание:
+            - Читает карты сайта из строк Sitemap файла robots.txt и /sitemap.xml.
+            - Читает RSS/Atom ленты, указанные в теге <link rel="alternate"> раздела.
+            - Пропускает ссылки на другие сайты, на сам раздел, на страницы списка
+              и на адреса вне раздела.
+
+        Возвращает:
+            Iterator[str]: Ссылки на новости без повторов, по мере чтения файлов.
+        """
+        parts = urlsplit(normalize_url(url))
+        host, prefix = parts.netloc, parts.path
+        section = normalize_url(url)
+        seen = set()
+        for source in self._sources(url):
+            for href in self._read(source, depth=0):
+                key = normalize_url(href)
+                target = urlsplit(key)
+                if (key in seen or target.netloc != host or key == section
+                        or not target.path.startswith(prefix) or page_number(key)):
+                    continue
+                seen.add(key)
+                yield href
+
+    def _sources(self, url) -> list:
+        """
+        Возвращает адреса карт сайта и лент для раздела.
+
+        Аргументы:
+            url (str): Адрес раздела новостей.
+        """
+        root = urljoin(url, '/')
+        sources = []
+        try:
+            response = self.session.get(urljoin(root, '/robots.txt'), timeout=self.timeout)
+            if response.ok:
+                for line in response.text.splitlines():
+                    name, _, value = line.partition(':')
+                    if name.strip().lower() == 'sitemap' and value.strip():
+                        sources.append(urljoin(root, value.strip()))
+        except requests.RequestException:
+            pass
+        if not sources:
+            sources.append(urljoin(root, '/sitemap.xml'))
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+            if response.ok:
+                sources += Page(response.url, response.content,
+                                 encoding=header_encoding(response)).feed_links()
+        except requests.RequestException:
+            pass
+        return list(dict.fromkeys(sources))
+
+    def _read(self, url, depth):
+        """
+        Потоково читает карту сайта, индекс карт сайта или ленту.
+
+        Аргументы:
+            url (str): Адрес файла.
+            depth (int): Текущая глубина вложенности индексов.
+
+        Возвращает:
+            Iterator[str]: Найденные ссылки на страницы.
+        """
+        nested = []
+        try:
+            with METRICS.timer('sitemap_load', site=urlsplit(url).netloc), \
+                    self.session.get(url, timeout=self.timeout, stream=True) as response:
+                if not response.ok:
+                    return
+                parser = etree.XMLPullParser(events=('end',), recover=True,
+                                             resolve_entities=False, no_network=True)
+                decompressor = None
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    if decompressor is None and chunk[:2] == GZIP_MAGIC:
+                        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                    parser.feed(decompressor.decompress(chunk) if decompressor else chunk)
+                    for kind, link in self._links(parser):
+                        if kind == 'sitemap':
+                            nested.append(link)
+                        else:
+                            yield link
+                parser.close()
+        except (requests.RequestException, etree.XMLSyntaxError, zlib.error):
+            return
+        if depth < self.max_depth:
+            for link in nested:
+                yield from self._read(urljoin(url, link), depth + 1)
+
+    @staticmethod
+    def _links(parser):
+        """
+        Забирает ссылки из уже разобранной части XML и освобождает память
+        за прочитанными элементами.
+
+        Берутся только теги `loc` карты сайта внутри `url` или `sitemap`; теги
+        `image:loc` и `video:loc` из расширений карт сайта пропускаются.
+
+        Аргументы:
+            parser (etree.XMLPullParser): Инкрементальный парсер.
+
+        Возвращает:
+            Iterator[tuple]: Пары (`sitemap` или `page`, ссылка).
+        """
+        for _, element in parser.read_events():
+            name = _local_name(element.tag)
+            parent = element.getparent()
+            parent_name = _local_name(parent.tag) if parent is not None else ''
+            if name == 'loc':
+                if (element.text and parent_name in ('url', 'sitemap')
+                        and _namespace(element.tag) in SITEMAP_NAMESPACES):
+                    yield ('sitemap' if parent_name == 'sitemap' else 'page'), element.text.strip()
+            elif name == 'link' and parent_name in ('item', 'entry'):
+                href = element.get('href') or element.text
+                if href and element.get('rel', 'alternate') == 'alternate':
+                    yield 'page', href.strip()
+            elif name in ('url', 'sitemap', 'item', 'entry'):
+                element.clear()
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
@@ -0,0 +1,193 @@
+"""Модуль пула экземпляров Chrome WebDriver.
+
+Этот модуль содержит класс `DriverPool`, который держит ограниченное число
+запущенных браузеров и выдает их потокам по запросу. Запуск Chrome занимает
+больше времени, чем загрузка страницы, поэтому браузеры переиспользуются
+для всех ссылок и всех новостей.
+
+Основные функции:
+- Выдача браузера потоку и возврат его в пул.
+- Проверка работоспособности браузера перед выдачей.
+- Перезапуск браузера после заданного числа страниц, чтобы ограничить рост памяти.
+- Закрытие всех браузеров при завершении работы.
+
+Пример использования:
+```python
+pool = DriverPool(size=2)
+with pool.acquire() as browser:
+    browser.get('https://example.by/')
+pool.close()
+```
+"""
+
+import threading
+from contextlib import contextmanager
+from selenium import webdriver
+from metrics import METRICS
+
+
+def chrome_options():
+    """
+    Создает опции для запуска Chrome WebDriver в фоновом режиме.
+
+    Возвращает:
+        webdriver.ChromeOptions: Опции для настройки Chrome WebDriver.
+    """
+    options = webdriver.ChromeOptions()
+    options.add_argument('--disable-blink-features=AutomationControlled')
+    options.add_argument('--headless=new')
+    return options
+
+
+class DriverPool:
+    """
+    Потокобезопасный пул экземпляров Chrome WebDriver.
+
+    Атрибуты:
+        size (int): Максимальное число одновременно запущенных браузеров.
+        options (webdriver.ChromeOptions): Опции для запуска Chrome WebDriver.
+        max_pages (int): Число страниц, после которого браузер перезапускается.
+    """
+    def __init__(self, size=4, options=None, max_pages=50):
+        """
+        Инициализация объекта DriverPool.
+
+        Аргументы:
+            size (int): Максимальное число одновременно запущенных браузеров.
+            options (webdriver.ChromeOptions, optional): Опции для запуска Chrome WebDriver.
+            max_pages (int): Число страниц, после которого браузер перезапускается.
+
+        Описание:
+            Браузеры запускаются только при первом запросе, поэтому пул,
+            который не используется, ничего не стоит.
+        """
+        self.size = size
+        self.options = options or chrome_options()
+        self.max_pages = max_pages
+        self._idle = []
+        self._created = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @contextmanager
+    def acquire(self, timeout=None):
+        """
+        Выдает браузер из пула на время блока `with`.
+
+        Аргументы:
+            timeout (float, optional): Сколько секунд ждать свободный браузер.
+                По умолчанию ждет без ограничения.
+
+        Возвращает:
+            webdriver.Chrome: Работающий браузер.
+
+        Исключения:
+            TimeoutError: Если за `timeout` секунд не освободился ни один браузер.
+            RuntimeError: Если пул уже закрыт.
+        """
+        browser, pages = self._checkout(timeout)
+        try:
+            yield browser
+        finally:
+            self._checkin(browser, pages + 1)
+
+    def close(self) -> None:
+        """
+        Закрывает все свободные браузеры. Занятые браузеры закрываются при возврате.
+        """
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._created -= len(idle)
+            self._cond.notify_all()
+        for browser, _ in idle:
+            self._quit(browser)
+
+    def _checkout(self, timeout):
+        """
+        Берет свободный браузер или запускает новый, если пул еще не заполнен.
+
+        Аргументы:
+            timeout (float | None): Сколько секунд ждать свободный браузер.
+
+        Возвращает:
+            tuple: Браузер и число страниц, которые он уже открыл.
+        """
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Пул браузеров закрыт")
+                if self._idle:
+                    browser, pages = self._idle.pop()
+                    break
+                if self._created < self.size:
+                    self._created += 1
+                    browser, pages = None, 0
+                    break
+                if not self._cond.wait(timeout):
+                    raise TimeoutError("Нет свободных браузеров")
+
+        if browser is not None and not self._is_alive(browser):
+            self._quit(browser)
+            browser, pages = None, 0
+        if browser is None:
+            try:
+                with METRICS.timer('browser_startup'):
+                    browser = webdriver.Chrome(options=self.options)
+            except Exception:
+                with self._cond:
+                    self._created -= 1
+                    self._cond.notify()
+                raise
+        return browser, pages
+
+    def _checkin(self, browser, pages):
+        """
+        Возвращает браузер в пул или закрывает его, если он открыл слишком много страниц.
+
+        Аргументы:
+            browser (webdriver.Chrome): Возвращаемый браузер.
+            pages (int): Число страниц, которые браузер уже открыл.
+        """
+        with self._cond:
+            keep = not self._closed and pages < self.max_pages
+            if keep:
+                self._idle.append((browser, pages))
+            else:
+                self._created -= 1
+            self._cond.notify()
+        if not keep:
+            self._quit(browser)
+
+    @staticmethod
+    def _is_alive(browser) -> bool:
+        """
+        Проверяет, что браузер отвечает на команды.
+
+        Аргументы:
+            browser (webdriver.Chrome): Проверяемый браузер.
+        """
+        try:
+            _ = browser.current_url
+            return True
+        except Exception: # pylint: disable=broad-exception-caught
+            return False
+
+    @staticmethod
+    def _quit(browser) -> None:
+        """
+        Закрывает браузер, не прерывая работу при ошибке.
+
+        Аргументы:
+            browser (webdriver.Chrome): Закрываемый браузер.
+        """
+        try:
+            browser.quit()
+        except Exception: # pylint: disable=broad-exception-caught
+            pass
@@ -0,0 +1,134 @@
+"""Модуль для асинхронной записи логов ошибок.
+
+Этот модуль содержит функции для записи ошибок в файл error_logs.txt
+без блокировки рабочих потоков. Потоки только кладут запись в очередь,
+а в файл ее записывает отдельный фоновый поток. Файл не открывается
+заново для каждой строки и автоматически ротируется по размеру.
+
+Основные функции:
+- `start_logging`: Запуск фонового потока записи логов.
+- `log_error`: Постановка записи об ошибке в очередь.
+- `stop_logging`: Запись оставшихся строк и остановка фонового потока.
+
+Пример использования:
+```python
+start_logging('error_logs.txt')
+log_error("Возможно некорректная ссылка", url='https://example.com/',
+          article='https://example.by/news/1/', exc=error, elapsed=1.5)
+stop_logging()
+```
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+
+
+LOGGER_NAME = 'search_error_link'
+FIELDS = ('url', 'article', 'exc_type', 'elapsed')
+
+_logger = logging.getLogger(LOGGER_NAME)
+_logger.setLevel(logging.INFO)
+_logger.propagate = False
+_listener = None
+_lock = threading.Lock()
+
+
+class _RecordFormatter(logging.Formatter):
+    """
+    Форматирует запись в одну строку: время, текст ошибки и заполненные поля.
+    """
+    def format(self, record):
+        message = f"{self.formatTime(record)} Ошибка: {record.getMessage()}"
+        fields = [f"{name}={getattr(record, name)}" for name in FIELDS
+                  if getattr(record, name, None) is not None]
+        if fields:
+            message += " | " + " ".join(fields)
+        return message
+
+
+def start_logging(path='error_logs.txt', max_bytes=5 * 1024 * 1024, backups=3) -> None:
+    """
+    Запускает фоновый поток, который записывает логи в файл.
+
+    Аргументы:
+        path (str): Путь к файлу логов.
+        max_bytes (int): Размер файла, после которого он ротируется.
+        backups (int): Число сохраняемых старых файлов логов.
+
+    Описание:
+        Повторный вызов ничего не делает, пока логирование не остановлено
+        функцией `stop_logging`.
+    """
+    global _listener # pylint: disable=global-statement
+    with _lock:
+        if _listener is not None:
+            return
+        records = queue.SimpleQueue()
+        handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backups, encoding='utf-8', delay=True
+        )
+        handler.setFormatter(_RecordFormatter())
+        _logger.handlers = [logging.handlers.QueueHandler(records)]
+        _listener = logging.handlers.QueueListener(records, handler)
+        _listener.start()
+
+
+def log_error(message, url=None, article=None, exc=None, elapsed=None) -> None:
+    """
+    Ставит запись об ошибке в очередь на запись в файл.
+
+    Аргументы:
+        message (str): Текст ошибки.
+        url (str, optional): Ссылка, при обработке которой произошла ошибка.
+        article (str, optional): Новость, в которой находится ссылка.
+        exc (BaseException | str, optional): Исключение или название его типа.
+        elapsed (float, optional): Длительность операции в секундах.
+    """
+    if _listener is None:
+        start_logging()
+    if isinstance(exc, BaseException):
+        exc = type(exc).__name__
+    _logger.error(message, extra={
+        'url': url,
+        'article': article,
+        'exc_type': exc,
+        'elapsed': None if elapsed is None else f"{elapsed:.3f}",
+    })
+
+
+def stop_logging() -> None:
+    """
+    Записывает все строки из очереди в файл и останавливает фоновый поток.
+    """
+    global _listener # pylint: disable=global-statement
+    with _lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _logger.handlers = []
+        _listener = None
+
+
+def _reset_after_fork() -> None:
+    """
+    Сбрасывает состояние логирования в дочернем процессе после fork.
+
+    Дочерний процесс наследует `_listener` и обработчик очереди, но не фоновый
+    поток, который читает очередь, поэтому без сброса `start_logging` ничего
+    не делает, а записи попадают в очередь, которую никто не читает.
+    """
+    global _listener, _lock # pylint: disable=global-statement
+    _listener = None
+    _lock = threading.Lock()
+    _logger.handlers = []
+
+
+atexit.register(stop_logging)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
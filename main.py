@@ -5,38 +5,264 @@
 и запускает процесс проверки ссылок. Проверка выполняется для указанных URL-адресов,
 и результаты сохраняются в Excel файл.
 
+Если ссылки не переданы в аргументах командной строки, программа запрашивает
+их в консоли. Список многих сайтов можно передать файлом настроек `--config`,
+тогда сайты проверяются в нескольких процессах (модуль `orchestrator`).
+Если ссылки переданы, программа работает без вопросов и сразу
+завершается с кодом возврата, поэтому ее можно запускать по расписанию (cron, CI).
+
+Коды возврата:
+- 0: Неработающих ссылок не найдено.
+- 1: Найдены неработающие ссылки.
+- 2: Неправильные аргументы командной строки.
+- 3: Проверка хотя бы одной ссылки не удалась (сайт не ответил, новости
+  не найдены или произошла ошибка), поэтому ее итоги неполные.
+
 Пример использования:
 ```bash
 python main.py
-
+python main.py -q https://gemma.by/news/
+python main.py -q --file urls.txt --format xlsx --format jsonl --workers 8
+python main.py -q --config sites.json --processes 8 --summary summary.json
+```
 """
 
+import argparse
+import sys
 from concurrent.futures import ThreadPoolExecutor
 from checker import LinkChecker
-from utils import print_choice, get_time_script
+from discovery import DISCOVERY_MODES
+from logs import start_logging, stop_logging
+from metrics import METRICS
+from orchestrator import load_config, run_sites, write_summary
+from pages import BACKENDS
+from report import FORMATS
+from urls import INDEX_MODES, TRACKING_PARAMS
+from utils import is_valid_url, print_choice, print_slowly, get_time_script, set_quiet
+
+
+def parse_args(argv=None):
+    """
+    Разбирает аргументы командной строки.
+
+    Аргументы:
+        argv (list, optional): Аргументы командной строки. По умолчанию sys.argv[1:].
+
+    Возвращает:
+        argparse.Namespace: Разобранные аргументы.
+    """
+    parser = argparse.ArgumentParser(
+        description="Проверка ссылок в новостях интернет-магазина."
+    )
+    parser.add_argument('urls', nargs='*', metavar='URL',
+                        help="ссылка на список новостей в формате https://домен/путь/")
+    parser.add_argument('-f', '--file',
+                        help="файл со ссылками, по одной на строку (строки с # пропускаются)")
+    parser.add_argument('--config',
+                        help="файл JSON со списком сайтов и их параметров для проверки "
+                             "в нескольких процессах")
+    parser.add_argument('--processes', type=int,
+                        help="число процессов для --config (по умолчанию число ядер)")
+    parser.add_argument('--summary', default='summary.json',
+                        help="файл общих итогов для --config (по умолчанию summary.json)")
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help="выводить текст сразу, без анимации и ожидания перед выходом")
+    parser.add_argument('--workers', type=int, default=5,
+                        help="число ссылок, которые проверяются одновременно (по умолчанию 5)")
+    parser.add_argument('--article-workers', type=int, default=4,
+                        help="число новостей одной ссылки, которые обрабатываются одновременно")
+    parser.add_argument('--listing-workers', type=int, default=4,
+                        help="число страниц со списком новостей одной ссылки, "
+                             "которые загружаются одновременно")
+    parser.add_argument('--max-listing-pages', type=int, default=0,
+                        help="максимальный номер страницы со списком новостей, которая "
+                             "загружается (по умолчанию 0 — все страницы)")
+    parser.add_argument('--browser-workers', type=int, default=4,
+                        help="максимальное число одновременно запущенных браузеров")
+    parser.add_argument('--probe-workers', type=int, default=20,
+                        help="число потоков для проверки ссылок в новостях")
+    parser.add_argument('--per-host', type=int, default=4,
+                        help="число одновременных запросов к одному хосту")
+    parser.add_argument('--timeout', type=float, default=30,
+                        help="таймаут ожидания ответа при проверке ссылки в секундах")
+    parser.add_argument('--connect-timeout', type=float, default=10,
+                        help="таймаут установки соединения при проверке ссылки в секундах")
+    parser.add_argument('--retries', type=int, default=2,
+                        help="число повторов проверки ссылки при ответах 429/5xx и таймаутах")
+    parser.add_argument('--host-rate', type=float, default=10,
+                        help="число запросов в секунду к одному хосту (0 — без ограничения)")
+    parser.add_argument('--backend', choices=BACKENDS, default='auto',
+                        help="источник страниц (по умолчанию auto)")
+    parser.add_argument('--discovery', choices=DISCOVERY_MODES, default='listing',
+                        help="способ поиска новостей: обход страниц списка (listing), "
+                             "карты сайта и RSS (sitemap) или карты сайта с переходом "
+                             "на обход страниц, если новости не найдены (auto)")
+    parser.add_argument('--format', dest='formats', action='append', choices=FORMATS,
+                        help="формат отчета, можно указать несколько раз (по умолчанию xlsx)")
+    parser.add_argument('--strip-param', dest='strip_params', action='append',
+                        metavar='NAME',
+                        help="параметр запроса, который удаляется из ссылок перед проверкой "
+                             "в дополнение к utm_* и другим меткам; можно указать несколько "
+                             "раз, имя с * на конце удаляет все параметры с таким началом")
+    parser.add_argument('--link-index', choices=INDEX_MODES, default='hash',
+                        help="индекс проверенных ссылок: hash или bloom (фильтр Блума "
+                             "фиксированного размера для очень больших обходов)")
+    parser.add_argument('--cache',
+                        help="файл SQLite для хранения проверенных ссылок между запусками")
+    parser.add_argument('--cache-max-age', type=float, default=12,
+                        help="через сколько часов ссылку из файла кэша нужно проверить заново")
+    parser.add_argument('--state',
+                        help="файл SQLite для хранения состояния новостей; неизмененные "
+                             "новости не проверяются заново")
+    parser.add_argument('--state-ttl', type=float, default=24,
+                        help="через сколько часов ссылки неизмененной новости нужно "
+                             "проверить заново (по умолчанию 24)")
+    parser.add_argument('--checkpoint',
+                        help="файл SQLite для сохранения хода проверки, чтобы прерванный "
+                             "запуск можно было продолжить")
+    parser.add_argument('--resume', action='store_true',
+                        help="продолжить прерванную проверку из файла --checkpoint")
+    parser.add_argument('--log-file', default='error_logs.txt',
+                        help="файл логов ошибок (по умолчанию error_logs.txt)")
+    parser.add_argument('--metrics-json',
+                        help="файл для сохранения длительности этапов в формате JSON")
+    parser.add_argument('--metrics-prom',
+                        help="файл для сохранения гистограмм в текстовом формате Prometheus")
+    args = parser.parse_args(argv)
+
+    if args.resume and not args.checkpoint:
+        parser.error("для --resume нужно указать файл --checkpoint")
+    if args.file:
+        try:
+            with open(args.file, encoding='utf-8') as f:
+                args.urls += [line.strip() for line in f
+                              if line.strip() and not line.lstrip().startswith('#')]
+        except OSError as e:
+            parser.error(f"не удалось прочитать файл {args.file}: {e}")
+    wrong_urls = [url for url in args.urls if not is_valid_url(url)]
+    if wrong_urls:
+        parser.error(f"неправильный формат ссылки: {', '.join(wrong_urls)}")
+    args.urls = list(dict.fromkeys(args.urls))
+    args.sites = []
+    if args.config:
+        try:
+            args.sites = load_config(args.config, checker_options(args))
+        except (OSError, ValueError) as e:
+            parser.error(f"не удалось прочитать файл {args.config}: {e}")
+        configured = {url for url, _ in args.sites}
+        args.sites += [(url, checker_options(args)) for url in args.urls
+                       if url not in configured]
+    return args
+
+
+def checker_options(args) -> dict:
+    """
+    Возвращает параметры `LinkChecker` из аргументов командной строки.
+
+    Аргументы:
+        args (argparse.Namespace): Разобранные аргументы.
+    """
+    return {
+        'probe_workers': args.probe_workers,
+        'probe_per_host': args.per_host,
+        'probe_timeout': args.timeout,
+        'probe_connect_timeout': args.connect_timeout,
+        'probe_retries': args.retries,
+        'probe_host_rate': args.host_rate,
+        'cache_path': args.cache,
+        'cache_max_age': args.cache_max_age * 3600,
+        'backend': args.backend,
+        'article_workers': args.article_workers,
+        'listing_workers': args.listing_workers,
+        'max_listing_pages': args.max_listing_pages,
+        'browser_workers': args.browser_workers,
+        'report_formats': args.formats or ('xlsx',),
+        'state_path': args.state,
+        'state_link_ttl': args.state_ttl * 3600,
+        'discovery': args.discovery,
+        'checkpoint_path': args.checkpoint,
+        'resume': args.resume,
+        'strip_params': TRACKING_PARAMS + tuple(args.strip_params or ()),
+        'link_index': args.link_index,
+    }
+
+
+def exit_code(summaries) -> int:
+    """
+    Возвращает код возврата по итогам проверки.
+
+    Аргументы:
+        summaries (list): Итоги проверки (`CheckSummary`).
+
+    Возвращает:
+        int: 3, если проверка хотя бы одной ссылки не удалась, 1, если найдены
+            неработающие ссылки, иначе 0.
+    """
+    if any(summary.failed for summary in summaries):
+        return 3
+    return 1 if any(summary.broken for summary in summaries) else 0
+
+
+def write_metrics(args) -> None:
+    """
+    Сохраняет гистограммы длительности этапов в файлы `--metrics-json`
+    и `--metrics-prom`, если они заданы.
+
+    Аргументы:
+        args (argparse.Namespace): Разобранные аргументы командной строки.
+    """
+    if args.metrics_json:
+        METRICS.write_json(args.metrics_json)
+    if args.metrics_prom:
+        METRICS.write_prometheus(args.metrics_prom)
 
 
 @get_time_script
-def main():
+def main(argv=None):
     """
     Запускает процесс проверки ссылок на веб-страницах.
-    Copy
 
     Эта функция инициализирует объект `LinkChecker` с указанными URL-адресами,
-    запрашивает выбор пользователя через функцию `print_choice`, и затем
-    использует `ThreadPoolExecutor` для параллельной обработки ссылок.
-    Результаты проверки сохраняются в Excel файл.
+    а если ссылки не переданы в аргументах, запрашивает их через функцию `print_choice`.
+    Затем использует `ThreadPoolExecutor` для параллельной обработки ссылок.
+    Результаты проверки сохраняются в отчет.
+    Если задан файл настроек `--config`, сайты проверяются в нескольких процессах,
+    а общие итоги сохраняются в файл `--summary`.
+
+    Аргументы:
+        argv (list, optional): Аргументы командной строки. По умолчанию sys.argv[1:].
 
     Возвращает:
-        None: Функция ничего не возвращает, она только запускает процесс проверки.
+        int: Код возврата: 3, если проверка хотя бы одной ссылки не удалась,
+            1, если найдены неработающие ссылки, иначе 0.
     """
-    urls = set()
-    urls = print_choice(urls)
-    checker = LinkChecker(urls)
+    args = parse_args(argv)
+    set_quiet(args.quiet)
+    start_logging(args.log_file)
+    if args.sites:
+        summaries = run_sites(args.sites, processes=args.processes, log_path=args.log_file)
+        write_summary(summaries, args.summary)
+        stop_logging()
+        write_metrics(args)
+        total = sum(summary.broken for summary in summaries)
+        print_slowly(f"Всего неработающих ссылок: {total}, итоги в файле {args.summary}\n")
+        return exit_code(summaries)
+
+    urls = args.urls or print_choice(set())
+    checker = LinkChecker(urls, **checker_options(args))
+
+    # Используем ThreadPoolExecutor для параллельной обработки ссылок.
+    # Каждый вызов check_links возвращает собственные итоги проверки,
+    # поэтому потоки не разделяют общий список найденных ссылок.
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        summaries = list(executor.map(checker.check_links, urls))
+    checker.close()
+    stop_logging()
+    write_metrics(args)
 
-    # Используем ThreadPoolExecutor для параллельной обработки ссылок
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        executor.map(checker.check_links, urls)
+    total = sum(summary.broken for summary in summaries)
+    print_slowly(f"Всего неработающих ссылок: {total}\n")
+    return exit_code(summaries)
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
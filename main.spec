@@ -5,7 +5,7 @@ a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
-    datas=[('checker.py', '.'), ('utils.py', '.')],
+    datas=[('cache.py', '.'), ('checker.py', '.'), ('checkpoint.py', '.'), ('crawl_state.py', '.'), ('discovery.py', '.'), ('driver_pool.py', '.'), ('logs.py', '.'), ('metrics.py', '.'), ('orchestrator.py', '.'), ('pages.py', '.'), ('pagination.py', '.'), ('prober.py', '.'), ('report.py', '.'), ('results.py', '.'), ('throttle.py', '.'), ('urls.py', '.'), ('utils.py', '.')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
@@ -0,0 +1,265 @@
+"""Модуль для измерения времени этапов проверки ссылок.
+
+Этот модуль содержит класс `Metrics`, который собирает гистограммы
+длительности основных этапов работы: запуск браузера, загрузка страницы
+со списком новостей, ожидание элементов в WebDriverWait, открытие новости,
+проверка каждой ссылки и запись отчета. Для каждого этапа гистограммы
+ведутся отдельно по сайтам и по хостам проверяемых ссылок, поэтому видно,
+что замедляет проверку: Chrome, сам сайт или внешние хосты.
+
+Основные функции:
+- `METRICS`: Общий для всей программы объект `Metrics`.
+- `Metrics.timer`: Контекстный менеджер для измерения длительности этапа.
+- `Metrics.phases`: Итоги этапов по всем сайтам и хостам вместе.
+- `Metrics.export` и `Metrics.merge`: Передача гистограмм из процессов-обработчиков
+  в основной процесс.
+- `Metrics.write_json`: Сохранение итогов в JSON файл.
+- `Metrics.write_prometheus`: Сохранение гистограмм в текстовом формате Prometheus.
+
+Пример использования:
+```python
+with METRICS.timer('listing_load', site='example.by'):
+    page = source.fetch(url)
+METRICS.write_json('metrics.json')
+```
+"""
+
+import bisect
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+class Histogram:
+    """
+    Гистограмма длительностей с фиксированными границами корзин.
+
+    Атрибуты:
+        counts (list): Число наблюдений в каждой корзине; последняя корзина — больше 60 секунд.
+        count (int): Общее число наблюдений.
+        total (float): Сумма всех длительностей в секундах.
+        max (float): Максимальная длительность в секундах.
+    """
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds) -> None:
+        """
+        Добавляет одно наблюдение.
+
+        Аргументы:
+            seconds (float): Длительность в секундах.
+        """
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def merge(self, other) -> None:
+        """
+        Добавляет все наблюдения другой гистограммы.
+
+        Аргументы:
+            other (Histogram): Гистограмма с теми же границами корзин.
+        """
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, q) -> float:
+        """
+        Оценивает процентиль по границам корзин.
+
+        Аргументы:
+            q (float): Доля от 0 до 1, например 0.95.
+
+        Возвращает:
+            float: Верхняя граница корзины, в которую попадает процентиль,
+                но не больше максимального наблюдения.
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        """
+        Возвращает итоги гистограммы для JSON.
+        """
+        return {
+            'count': self.count,
+            'total': round(self.total, 6),
+            'mean': round(self.total / self.count, 6) if self.count else 0.0,
+            'p50': round(self.percentile(0.5), 6),
+            'p90': round(self.percentile(0.9), 6),
+            'p99': round(self.percentile(0.99), 6),
+            'max': round(self.max, 6),
+        }
+
+
+class Metrics:
+    """
+    Потокобезопасный набор гистограмм по этапам, сайтам и хостам.
+    """
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self._started = time.time()
+
+    def reset(self) -> None:
+        """
+        Удаляет все накопленные гистограммы.
+        """
+        with self._lock:
+            self._histograms = {}
+            self._started = time.time()
+
+    def observe(self, phase, seconds, site=None, host=None) -> None:
+        """
+        Добавляет длительность этапа.
+
+        Аргументы:
+            phase (str): Название этапа, например `link_probe`.
+            seconds (float): Длительность в секундах.
+            site (str, optional): Проверяемый сайт.
+            host (str, optional): Хост проверяемой ссылки.
+        """
+        key = (phase, site or '', host or '')
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, phase, site=None, host=None):
+        """
+        Измеряет длительность блока `with` и добавляет ее в гистограмму этапа.
+
+        Аргументы:
+            phase (str): Название этапа.
+            site (str, optional): Проверяемый сайт.
+            host (str, optional): Хост проверяемой ссылки.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(phase, time.perf_counter() - started, site=site, host=host)
+
+    def snapshot(self) -> dict:
+        """
+        Возвращает копию всех гистограмм.
+
+        Возвращает:
+            dict: Ключ — кортеж (этап, сайт, хост), значение — итоги гистограммы.
+        """
+        with self._lock:
+            return {key: histogram.summary() for key, histogram in self._histograms.items()}
+
+    def export(self) -> dict:
+        """
+        Возвращает копию всех гистограмм для передачи в другой процесс.
+
+        Возвращает:
+            dict: Ключ — кортеж (этап, сайт, хост), значение — `Histogram`.
+        """
+        exported = {}
+        with self._lock:
+            for key, histogram in self._histograms.items():
+                exported[key] = Histogram()
+                exported[key].merge(histogram)
+        return exported
+
+    def merge(self, histograms) -> None:
+        """
+        Добавляет гистограммы, полученные методом `export` в другом процессе.
+
+        Аргументы:
+            histograms (dict): Ключ — кортеж (этап, сайт, хост), значение — `Histogram`.
+        """
+        with self._lock:
+            for key, other in histograms.items():
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = Histogram()
+                histogram.merge(other)
+
+    def phases(self) -> dict:
+        """
+        Возвращает итоги этапов по всем сайтам и хостам вместе.
+
+        Корзины гистограмм складываются, поэтому процентили считаются
+        по всем наблюдениям этапа, а не по отдельным хостам.
+
+        Возвращает:
+            dict: Ключ — название этапа, значение — итоги объединенной гистограммы.
+        """
+        merged = {}
+        with self._lock:
+            for (phase, _, _), histogram in self._histograms.items():
+                merged.setdefault(phase, Histogram()).merge(histogram)
+        return {phase: histogram.summary() for phase, histogram in merged.items()}
+
+    def write_json(self, path) -> None:
+        """
+        Сохраняет итоги всех гистограмм в JSON файл.
+
+        Аргументы:
+            path (str): Путь к файлу.
+        """
+        phases = {}
+        for (phase, site, host), summary in sorted(self.snapshot().items()):
+            phases.setdefault(phase, []).append({'site': site, 'host': host, **summary})
+        data = {
+            'started': self._started,
+            'finished': time.time(),
+            'phases': phases,
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+    def write_prometheus(self, path) -> None:
+        """
+        Сохраняет гистограммы в текстовом формате Prometheus (например, для node_exporter
+        textfile collector).
+
+        Аргументы:
+            path (str): Путь к файлу.
+        """
+        with self._lock:
+            items = sorted((key, list(h.counts), h.count, h.total)
+                           for key, h in self._histograms.items())
+        lines = [
+            "# HELP search_error_link_phase_seconds Длительность этапов проверки ссылок.",
+            "# TYPE search_error_link_phase_seconds histogram",
+        ]
+        for (phase, site, host), counts, count, total in items:
+            labels = f'phase="{phase}",site="{site}",host="{host}"'
+            cumulative = 0
+            for bound, bucket in zip(BUCKETS, counts):
+                cumulative += bucket
+                lines.append(
+                    f'search_error_link_phase_seconds_bucket{{{labels},le="{bound}"}} {cumulative}'
+                )
+            lines.append(f'search_error_link_phase_seconds_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f'search_error_link_phase_seconds_sum{{{labels}}} {total}')
+            lines.append(f'search_error_link_phase_seconds_count{{{labels}}} {count}')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+
+
+METRICS = Metrics()
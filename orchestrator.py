@@ -0,0 +1,200 @@
+"""Модуль для проверки многих сайтов в нескольких процессах.
+
+Этот модуль читает список сайтов из файла настроек и распределяет их
+между процессами через общую очередь задач `ProcessPoolExecutor`. Каждый
+процесс работает на своем ядре процессора со своим объектом `LinkChecker`
+(своим пулом браузеров, потоками проверки ссылок и ограничениями по хостам),
+поэтому разбор HTML не упирается в GIL одного процесса, а производительность
+растет почти пропорционально числу ядер. Для каждого сайта создается
+собственный отчет, а итоги всех сайтов сохраняются в общий файл JSON.
+Гистограммы `METRICS` каждого процесса возвращаются вместе с итогами сайта
+и добавляются в `METRICS` основного процесса.
+
+Основные функции:
+- `load_config`: Чтение списка сайтов и их параметров из файла JSON.
+- `run_sites`: Проверка сайтов в нескольких процессах.
+- `write_summary`: Сохранение общих итогов в файл JSON.
+
+Формат файла настроек:
+```json
+{
+    "defaults": {"backend": "http", "report_formats": ["xlsx", "csv"]},
+    "sites": [
+        "https://gemma.by/news/",
+        {"url": "https://example.by/news/", "backend": "selenium"}
+    ]
+}
+```
+
+Пример использования:
+```python
+sites = load_config('sites.json')
+summaries = run_sites(sites, processes=4)
+write_summary(summaries, 'summary.json')
+```
+"""
+
+import inspect
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from checker import LinkChecker
+from metrics import METRICS
+from logs import log_error, start_logging, stop_logging
+from results import CheckSummary
+from utils import is_valid_url, print_slowly, set_quiet
+
+
+SITE_OPTIONS = tuple(
+    name for name in inspect.signature(LinkChecker).parameters if name != 'urls'
+)
+
+# Файл логов процесса-обработчика, задается в _start_worker
+_worker_log = None
+
+
+def load_config(path, defaults=None) -> list:
+    """
+    Читает список сайтов из файла настроек.
+
+    Аргументы:
+        path (str): Путь к файлу JSON: список ссылок или объект с ключами
+            `defaults` (общие параметры) и `sites` (ссылки или объекты с ключом `url`
+            и параметрами сайта).
+        defaults (dict, optional): Параметры по умолчанию, например из командной строки.
+            Параметры из файла имеют больший приоритет.
+
+    Возвращает:
+        list: Пары (ссылка, параметры `LinkChecker`) без повторяющихся ссылок.
+
+    Исключения:
+        ValueError: Если файл имеет неправильный формат, ссылка неправильная
+            или указан неизвестный параметр.
+    """
+    with open(path, encoding='utf-8') as f:
+        config = json.load(f)
+    if isinstance(config, list):
+        config = {'sites': config}
+    if not isinstance(config, dict) or not isinstance(config.get('sites'), list):
+        raise ValueError("в файле настроек нет списка sites")
+
+    common = {**(defaults or {}), **config.get('defaults', {})}
+    sites = {}
+    for site in config['sites']:
+        options = dict(site) if isinstance(site, dict) else {'url': site}
+        url = options.pop('url', None)
+        if not isinstance(url, str) or not is_valid_url(url):
+            raise ValueError(f"неправильный формат ссылки: {url}")
+        options = {**common, **options}
+        unknown = sorted(set(options) - set(SITE_OPTIONS))
+        if unknown:
+            raise ValueError(f"неизвестные параметры для {url}: {', '.join(unknown)}")
+        sites[url] = options
+    return list(sites.items())
+
+
+def _start_worker(log_path) -> None:
+    """
+    Настраивает процесс-обработчик: тихий режим и отдельный файл логов.
+
+    Аргументы:
+        log_path (str): Путь к общему файлу логов; процесс пишет в файл
+            с номером процесса в имени, чтобы процессы не мешали друг другу.
+    """
+    global _worker_log # pylint: disable=global-statement
+    set_quiet(True)
+    base, ext = os.path.splitext(log_path)
+    _worker_log = f"{base}.{os.getpid()}{ext}"
+
+
+def _run_site(url, options) -> tuple:
+    """
+    Проверяет один сайт в процессе-обработчике.
+
+    Аргументы:
+        url (str): Ссылка на список новостей сайта.
+        options (dict): Параметры `LinkChecker`.
+
+    Описание:
+        - Логи записываются до завершения задачи, потому что процессы-обработчики
+          завершаются без вызова обработчиков atexit.
+        - Гистограммы `METRICS` очищаются в начале задачи, поэтому возвращаются
+          только измерения этого сайта, даже если процесс уже проверял другие сайты.
+
+    Возвращает:
+        tuple: Пара (итоги проверки сайта `CheckSummary`, гистограммы
+            `METRICS.export()` этой проверки).
+    """
+    METRICS.reset()
+    start_logging(_worker_log)
+    checker = LinkChecker([url], **options)
+    try:
+        summary = checker.check_links(url)
+    finally:
+        checker.close()
+        stop_logging()
+    return summary, METRICS.export()
+
+
+def run_sites(sites, processes=None, log_path='error_logs.txt') -> list:
+    """
+    Проверяет сайты в нескольких процессах.
+
+    Аргументы:
+        sites (list): Пары (ссылка, параметры `LinkChecker`).
+        processes (int, optional): Число процессов. По умолчанию — число ядер процессора.
+        log_path (str): Путь к файлу логов.
+
+    Описание:
+        - Сайты ставятся в общую очередь задач, и каждый свободный процесс забирает
+          следующий сайт, поэтому долгие сайты не задерживают остальные.
+        - Ошибка при проверке одного сайта записывается в лог и не прерывает
+          проверку остальных сайтов.
+        - Гистограммы длительности этапов из процессов добавляются в `METRICS`
+          основного процесса, поэтому их можно сохранить как при обычном запуске.
+
+    Возвращает:
+        list: Итоги проверки (`CheckSummary`) в порядке сайтов в файле настроек.
+    """
+    processes = max(1, min(processes or os.cpu_count() or 1, len(sites) or 1))
+    summaries = {}
+    with ProcessPoolExecutor(max_workers=processes, initializer=_start_worker,
+                             initargs=(log_path,)) as pool:
+        futures = {pool.submit(_run_site, url, options): url for url, options in sites}
+        for future in as_completed(futures):
+            url = futures[future]
+            try:
+                summary, histograms = future.result()
+                METRICS.merge(histograms)
+            except Exception as e: # pylint: disable=broad-exception-caught
+                log_error(f"Ошибка при проверке сайта: {e}", url=url, exc=e)
+                summary = CheckSummary(url, failed=True)
+            summaries[url] = summary
+            status = ", проверка не удалась" if summary.failed else ""
+            print_slowly(f"{url}: новостей {summary.articles}, ссылок {summary.links}, "
+                         f"неработающих {summary.broken}{status}\n")
+    return [summaries[url] for url, _ in sites]
+
+
+def write_summary(summaries, path) -> None:
+    """
+    Сохраняет общие итоги проверки всех сайтов в файл JSON.
+
+    Аргументы:
+        summaries (list): Итоги проверки (`CheckSummary`).
+        path (str): Путь к файлу.
+    """
+    data = {
+        'finished': time.time(),
+        'sites': len(summaries),
+        'articles': sum(summary.articles for summary in summaries),
+        'links': sum(summary.links for summary in summaries),
+        'broken': sum(summary.broken for summary in summaries),
+        'failed': sum(summary.failed for summary in summaries),
+        'results': [
+            {**summary._asdict(), 'reports': list(summary.reports)} for summary in summaries
+        ],
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,372 @@
+"""Модуль источников страниц для обхода сайта.
+
+Этот модуль содержит классы, которые загружают страницы со списком новостей
+и сами новости и извлекают из них нужные ссылки. Извлечение одинаково для всех
+источников: HTML разбирается с помощью lxml, а источник отвечает только
+за получение HTML.
+
+Основные классы:
+- `Page`: Разобранная страница с методами для извлечения ссылок.
+- `PageSource`: Базовый класс источника страниц.
+- `HttpPageSource`: Загружает страницы обычными HTTP-запросами без браузера.
+- `SeleniumPageSource`: Загружает страницы через Chrome WebDriver.
+- `AutoPageSource`: Использует HTTP, а для страниц, которые строятся
+  через JavaScript или закрыты защитой от ботов, переключается на Selenium.
+
+Пример использования:
+```python
+with make_page_source('auto') as source:
+    page = source.fetch('https://example.by/news/', wait_for=NEWS_XPATH)
+    print(page.news_links())
+```
+"""
+
+import codecs
+import threading
+from urllib.parse import urlsplit
+import lxml.html
+import requests
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from driver_pool import DriverPool
+from metrics import METRICS
+
+
+NEWS_XPATH = "//div[@class='image']/a"
+TITLE_XPATH = "//h1"
+CONTENT_LINKS_XPATH = "//*[@id='content']//a"
+PAGINATION_LINKS_XPATH = (
+    "//*[contains(concat(' ', normalize-space(@class), ' '), ' pagination ')]//a"
+)
+FEED_LINKS_XPATH = (
+    "//link[@rel='alternate'][@type='application/rss+xml' or @type='application/atom+xml']"
+)
+
+BACKENDS = ('auto', 'http', 'selenium')
+
+# Статусы, которыми защита от ботов отвечает на запросы без браузера
+BLOCKED_STATUSES = (403, 429)
+
+# Заголовок User-Agent обычного браузера: многие сайты отвечают 403
+# на запросы со стандартным заголовком python-requests
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+)
+
+
+def _link_text(element):
+    """
+    Возвращает видимый текст ссылки без лишних пробелов.
+
+    Аргументы:
+        element (lxml.html.HtmlElement): Элемент ссылки.
+    """
+    return ' '.join(element.text_content().split())
+
+
+def header_encoding(response):
+    """
+    Возвращает кодировку, указанную в заголовке Content-Type ответа.
+
+    Аргументы:
+        response (requests.Response): Ответ сервера.
+
+    Возвращает:
+        str | None: Кодировка или None, если заголовок ее не указывает или она
+            неизвестна; тогда lxml определяет кодировку по тегу <meta charset>.
+    """
+    if 'charset=' not in response.headers.get('Content-Type', '').lower():
+        return None
+    try:
+        return codecs.lookup(response.encoding).name
+    except (LookupError, TypeError):
+        return None
+
+
+class Page:
+    """
+    Разобранная HTML-страница.
+
+    Атрибуты:
+        url (str): Адрес страницы после всех перенаправлений.
+        tree (lxml.html.HtmlElement): Дерево разобранного HTML.
+        etag (str | None): Заголовок ETag ответа сервера.
+        last_modified (str | None): Заголовок Last-Modified ответа сервера.
+    """
+    def __init__(self, url, html, etag=None, last_modified=None, encoding=None):
+        """
+        Инициализация объекта Page.
+
+        Аргументы:
+            url (str): Адрес страницы, относительно которого разрешаются ссылки.
+            html (str | bytes): HTML-код страницы.
+            etag (str, optional): Заголовок ETag ответа сервера.
+            last_modified (str, optional): Заголовок Last-Modified ответа сервера.
+            encoding (str, optional): Кодировка `html` в байтах из заголовка ответа.
+                Без нее lxml берет кодировку из тега <meta charset>, а если его нет,
+                читает страницу как latin-1.
+        """
+        self.url = url
+        self.etag = etag
+        self.last_modified = last_modified
+        parser = None
+        if encoding and isinstance(html, bytes):
+            parser = lxml.html.HTMLParser(encoding=encoding)
+        self.tree = lxml.html.document_fromstring(html, parser=parser, base_url=url)
+        self.tree.make_links_absolute(url, handle_failures='ignore')
+
+    def has(self, xpath) -> bool:
+        """
+        Проверяет, есть ли на странице элементы по выражению XPath.
+
+        Аргументы:
+            xpath (str): Выражение XPath.
+        """
+        return bool(self.tree.xpath(xpath))
+
+    def news_links(self) -> list:
+        """
+        Возвращает ссылки на новости со страницы списка новостей.
+        """
+        return [a.get('href') for a in self.tree.xpath(NEWS_XPATH) if a.get('href')]
+
+    def title(self) -> str:
+        """
+        Возвращает заголовок новости из тега h1.
+
+        Исключения:
+            ValueError: Если на странице нет заголовка h1.
+        """
+        headers = self.tree.xpath(TITLE_XPATH)
+        if not headers:
+            raise ValueError(f"Заголовок h1 не найден на странице {self.url}")
+        return _link_text(headers[0])
+
+    def content_links(self) -> list:
+        """
+        Возвращает ссылки из блока #content в виде пар (текст, ссылка).
+        """
+        return [(_link_text(a), a.get('href'))
+                for a in self.tree.xpath(CONTENT_LINKS_XPATH) if a.get('href')]
+
+    def pagination_links(self) -> list:
+        """
+        Возвращает ссылки из блока .pagination в виде пар (текст, ссылка).
+        """
+        return [(_link_text(a), a.get('href'))
+                for a in self.tree.xpath(PAGINATION_LINKS_XPATH) if a.get('href')]
+
+    def feed_links(self) -> list:
+        """
+        Возвращает ссылки на RSS и Atom ленты из тегов <link rel="alternate">.
+        """
+        return [link.get('href') for link in self.tree.xpath(FEED_LINKS_XPATH)
+                if link.get('href')]
+
+
+class PageSource:
+    """
+    Базовый класс источника страниц.
+
+    Наследники должны реализовать метод `fetch`.
+    """
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def fetch(self, url, wait_for=None, validators=None):
+        """
+        Загружает страницу.
+
+        Аргументы:
+            url (str): Адрес страницы.
+            wait_for (str, optional): Выражение XPath для элемента,
+                появления которого нужно дождаться.
+            validators (tuple, optional): Пара (ETag, Last-Modified) сохраненной
+                версии страницы для условного запроса. Источники, которые
+                не поддерживают условные запросы, ее игнорируют.
+
+        Возвращает:
+            Page | None: Разобранная страница или None, если сервер ответил,
+                что страница не изменилась (304 Not Modified).
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """
+        Освобождает ресурсы источника.
+        """
+
+
+class HttpPageSource(PageSource):
+    """
+    Источник страниц без браузера: HTML загружается HTTP-запросом.
+
+    Атрибуты:
+        timeout (float): Таймаут загрузки страницы в секундах.
+        session (requests.Session): Сессия с keep-alive соединениями.
+    """
+    def __init__(self, timeout=30):
+        """
+        Инициализация объекта HttpPageSource.
+
+        Аргументы:
+            timeout (float): Таймаут загрузки страницы в секундах.
+        """
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = USER_AGENT
+
+    def fetch(self, url, wait_for=None, validators=None):
+        headers = {}
+        if validators:
+            etag, last_modified = validators
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+        response = self.session.get(url, timeout=self.timeout, headers=headers)
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+        return Page(response.url, response.content,
+                    etag=response.headers.get('ETag'),
+                    last_modified=response.headers.get('Last-Modified'),
+                    encoding=header_encoding(response))
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class SeleniumPageSource(PageSource):
+    """
+    Источник страниц через Chrome WebDriver для сайтов, которые строят
+    страницы с помощью JavaScript.
+
+    Браузер берется из `DriverPool` только на время загрузки одной страницы,
+    поэтому один пул могут использовать все потоки и все источники.
+
+    Атрибуты:
+        pool (DriverPool): Пул браузеров.
+        wait (float): Время ожидания элемента `wait_for` в секундах.
+    """
+    def __init__(self, pool=None, wait=10):
+        """
+        Инициализация объекта SeleniumPageSource.
+
+        Аргументы:
+            pool (DriverPool, optional): Общий пул браузеров. Если не указан,
+                источник создает собственный пул и закрывает его в методе `close`.
+            wait (float): Время ожидания элемента `wait_for` в секундах.
+        """
+        self._owns_pool = pool is None
+        self.pool = pool or DriverPool()
+        self.wait = wait
+
+    def fetch(self, url, wait_for=None, validators=None):
+        with self.pool.acquire() as browser:
+            browser.get(url)
+            if wait_for:
+                with METRICS.timer('selenium_wait', site=urlsplit(url).netloc):
+                    WebDriverWait(browser, self.wait).until(
+                        EC.presence_of_element_located((By.XPATH, wait_for))
+                    )
+            return Page(browser.current_url, browser.page_source)
+
+    def close(self) -> None:
+        if self._owns_pool:
+            self.pool.close()
+
+
+class AutoPageSource(PageSource):
+    """
+    Источник страниц, который загружает HTML через HTTP и переключается
+    на Selenium, если нужного элемента нет в ответе сервера или сервер
+    отвечает статусом защиты от ботов (403 или 429). Остальные ошибки,
+    например 404, сразу возвращаются без запуска браузера.
+
+    Хост целиком переключается на Selenium только после `switch_after`
+    промахов подряд на страницах со списком новостей; одна новость без
+    заголовка h1 загружается через браузер, но не переключает хост.
+
+    Атрибуты:
+        switch_after (int): Число промахов подряд на страницах списка,
+            после которого все страницы хоста загружаются через Selenium.
+    """
+    def __init__(self, pool=None, timeout=30, switch_after=3):
+        """
+        Инициализация объекта AutoPageSource.
+
+        Аргументы:
+            pool (DriverPool, optional): Общий пул браузеров.
+            timeout (float): Таймаут загрузки страницы через HTTP в секундах.
+            switch_after (int): Число промахов подряд на страницах списка,
+                после которого все страницы хоста загружаются через Selenium.
+        """
+        self.http = HttpPageSource(timeout=timeout)
+        self.selenium = SeleniumPageSource(pool=pool)
+        self.switch_after = switch_after
+        self._browser_hosts = set()
+        self._misses = {}
+        self._lock = threading.Lock()
+
+    def fetch(self, url, wait_for=None, validators=None):
+        host = urlsplit(url).netloc.lower()
+        if host not in self._browser_hosts:
+            try:
+                page = self.http.fetch(url, validators=validators)
+            except requests.HTTPError as e:
+                if e.response is None or e.response.status_code not in BLOCKED_STATUSES:
+                    raise
+                page = False
+            if page is None or (page and (wait_for is None or page.has(wait_for))):
+                self._count_miss(host, wait_for, missed=False)
+                return page
+            self._count_miss(host, wait_for, missed=True)
+        return self.selenium.fetch(url, wait_for=wait_for)
+
+    def close(self) -> None:
+        self.http.close()
+        self.selenium.close()
+
+    def _count_miss(self, host, wait_for, missed) -> None:
+        """
+        Учитывает результат загрузки страницы списка через HTTP.
+
+        Аргументы:
+            host (str): Хост страницы.
+            wait_for (str | None): Выражение XPath нужного элемента; учитываются
+                только страницы со списком новостей.
+            missed (bool): True, если понадобился браузер.
+        """
+        if wait_for != NEWS_XPATH:
+            return
+        with self._lock:
+            misses = self._misses.get(host, 0) + 1 if missed else 0
+            self._misses[host] = misses
+            if misses >= self.switch_after:
+                self._browser_hosts.add(host)
+
+
+def make_page_source(backend='auto', pool=None):
+    """
+    Создает источник страниц по названию.
+
+    Аргументы:
+        backend (str): `auto`, `http` или `selenium`.
+        pool (DriverPool, optional): Общий пул браузеров.
+
+    Возвращает:
+        PageSource: Источник страниц.
+    """
+    if backend == 'http':
+        return HttpPageSource()
+    if backend == 'selenium':
+        return SeleniumPageSource(pool=pool)
+    if backend == 'auto':
+        return AutoPageSource(pool=pool)
+    raise ValueError(f"Неизвестный источник страниц: {backend}")
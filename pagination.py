@@ -0,0 +1,145 @@
+"""Модуль для поиска всех страниц со списком новостей.
+
+Этот модуль по ссылкам из блока .pagination определяет, как устроены
+адреса страниц списка новостей (параметр `PAGEN_N` в Битрикс или `page`),
+находит номер последней страницы и составляет адреса всех страниц сразу.
+Благодаря этому страницы списка загружаются параллельно, а не по одной
+через переход на следующую страницу.
+
+Основные функции:
+- `listing_key`: Ключ для удаления повторяющихся адресов страниц списка.
+- `page_number`: Номер страницы из адреса.
+- `discover_listing_urls`: Адреса всех страниц списка, найденных на странице.
+- `last_page_number`: Номер последней страницы списка по блоку .pagination.
+
+Пример использования:
+```python
+page = source.fetch('https://example.by/news/')
+for url in discover_listing_urls(page):
+    print(listing_key(url))
+```
+"""
+
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from utils import normalize_url
+
+
+PAGE_PARAM = re.compile(r'^(PAGEN_\d+|page)$', re.IGNORECASE)
+
+
+def page_number(url):
+    """
+    Находит в адресе параметр с номером страницы.
+
+    Аргументы:
+        url (str): Адрес страницы списка.
+
+    Возвращает:
+        tuple | None: Пара (имя параметра, номер страницы) или None,
+            если в адресе нет параметра `PAGEN_N` или `page` с числом.
+    """
+    for name, value in parse_qsl(urlsplit(url).query, keep_blank_values=True):
+        if PAGE_PARAM.match(name) and value.isdigit():
+            return name, int(value)
+    return None
+
+
+def with_page(url, param, number) -> str:
+    """
+    Возвращает адрес с заданным номером страницы.
+
+    Аргументы:
+        url (str): Адрес любой страницы списка.
+        param (str): Имя параметра с номером страницы.
+        number (int): Номер страницы.
+    """
+    parts = urlsplit(url)
+    query = [(name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+             if name != param]
+    query.append((param, str(number)))
+    return urlunsplit(parts._replace(query=urlencode(query), fragment=''))
+
+
+def listing_key(url) -> str:
+    """
+    Возвращает ключ страницы списка для удаления повторов.
+
+    Аргументы:
+        url (str): Адрес страницы списка.
+
+    Возвращает:
+        str: Нормализованный адрес без параметра первой страницы, поэтому
+            `/news/` и `/news/?PAGEN_1=1` дают один и тот же ключ.
+    """
+    parts = urlsplit(normalize_url(url))
+    query = [(name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+             if not (PAGE_PARAM.match(name) and value == '1')]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def _scan(page):
+    """
+    Разбирает ссылки блока .pagination.
+
+    Аргументы:
+        page (Page): Загруженная страница списка.
+
+    Возвращает:
+        tuple: Ссылки с номерами страниц, имя параметра с номером страницы
+            (или None), ссылка с самым большим номером и этот номер.
+    """
+    host = urlsplit(page.url).netloc.lower()
+    urls = []
+    param, base, last = None, None, 0
+    for text, href in page.pagination_links():
+        if urlsplit(href).netloc.lower() != host:
+            continue
+        if text.isdigit():
+            urls.append(href)
+        found = page_number(href)
+        if found is not None and found[1] > last:
+            (param, last), base = found, href
+    return urls, param, base, last
+
+
+def last_page_number(page) -> int:
+    """
+    Возвращает номер последней страницы списка, указанный в блоке .pagination.
+
+    Аргументы:
+        page (Page): Загруженная страница списка.
+
+    Возвращает:
+        int: Самый большой номер страницы в ссылках или 0, если ссылок с номером нет.
+    """
+    return _scan(page)[3]
+
+
+def discover_listing_urls(page, max_pages=None) -> list:
+    """
+    Находит адреса страниц списка новостей по блоку .pagination.
+
+    Аргументы:
+        page (Page): Загруженная страница списка.
+        max_pages (int, optional): Максимальный номер страницы, для которой
+            составляется адрес. По умолчанию составляются адреса всех страниц.
+
+    Описание:
+        - Берет ссылки с номерами страниц из блока .pagination.
+        - Если в ссылках есть параметр `PAGEN_N` или `page`, находит самый большой
+          номер страницы (в том числе в ссылке на последнюю страницу) и составляет
+          адреса всех страниц от первой до последней.
+        - Если задан `max_pages`, пропускает страницы с большим номером.
+        - Ссылки на другие сайты пропускаются.
+
+    Возвращает:
+        list: Адреса страниц списка; повторы не удаляются, для этого служит `listing_key`.
+    """
+    urls, param, base, last = _scan(page)
+    if max_pages:
+        last = min(last, max_pages)
+        urls = [url for url in urls if (page_number(url) or (None, 0))[1] <= max_pages]
+    if param is not None:
+        urls += [with_page(base, param, number) for number in range(1, last + 1)]
+    return urls
@@ -0,0 +1,517 @@
+"""Модуль для параллельной проверки внешних ссылок.
+
+Этот модуль содержит класс `LinkProber`, который проверяет доступность
+ссылок в пуле потоков через общую HTTP-сессию с keep-alive соединениями.
+Браузер только собирает ссылки и не ждет ответа от проверяемых сайтов.
+Для проверки используется запрос HEAD, тело ответа никогда не скачивается.
+
+Основные функции:
+- Проверка ссылок в ограниченном пуле потоков.
+- Повторное использование соединений с каждым хостом.
+- Ограничение числа одновременных запросов к одному хосту: ссылки ждут
+  в очереди своего хоста и не занимают поток пула, пока хост занят.
+- Однократная проверка каждой уникальной ссылки с помощью общего `LinkCache`
+  и компактного индекса рабочих ссылок `SeenIndex` на весь запуск.
+- Запрос HEAD с переходом на потоковый GET, если сервер не поддерживает HEAD.
+- Ограниченное следование перенаправлениям с записью всех переходов.
+- Ограничение частоты запросов к каждому хосту и повтор запросов с задержкой
+  при ответах 429/5xx и таймаутах, с учетом заголовка Retry-After. Ссылка,
+  которая ждет, не занимает поток пула: она возвращается в очередь по таймеру.
+- Быстрый отказ для хостов, которые не отвечают несколько раз подряд.
+
+Пример использования:
+```python
+with LinkProber(max_workers=20) as prober:
+    future = prober.submit('https://example.com/')
+    print(future.result().status)
+```
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import NamedTuple, Optional
+from urllib.parse import urljoin, urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from logs import log_error
+from metrics import METRICS
+from throttle import CircuitBreaker, Scheduler, TokenBucket, backoff_delay, retry_after
+from utils import normalize_url
+
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+TIMEOUT_ERRORS = ('Timeout', 'ReadTimeout', 'ConnectTimeout')
+CONNECTION_ERRORS = ('ConnectionError', 'SSLError', 'ProxyError', 'ChunkedEncodingError')
+HOST_DOWN_ERROR = 'CircuitOpen'
+
+
+class ProbeResult(NamedTuple):
+    """
+    Результат проверки одной ссылки.
+
+    Атрибуты:
+        url (str): Проверенная ссылка.
+        status (int | None): HTTP-статус ответа или None, если запрос не удался.
+        error (str | None): Текст ошибки, если запрос не удался.
+        final_url (str | None): Ссылка после всех перенаправлений.
+        redirects (tuple): Переходы в виде строк "<статус> <ссылка>".
+        error_type (str | None): Название типа исключения, если запрос не удался.
+        elapsed (float): Длительность проверки в секундах.
+        attempts (int): Число отправленных запросов с учетом повторов.
+    """
+    url: str
+    status: Optional[int] = None
+    error: Optional[str] = None
+    final_url: Optional[str] = None
+    redirects: tuple = ()
+    error_type: Optional[str] = None
+    elapsed: float = 0.0
+    attempts: int = 1
+
+    @property
+    def ok(self) -> bool:
+        """Возвращает True, если ссылка ответила статусом 200."""
+        return self.status == 200
+
+    @property
+    def host_failed(self) -> bool:
+        """Возвращает True, если хост не ответил: таймаут или ошибка соединения."""
+        return self.error_type in TIMEOUT_ERRORS or self.error_type in CONNECTION_ERRORS
+
+    @property
+    def retryable(self) -> bool:
+        """Возвращает True, если ошибка может быть временной и запрос стоит повторить."""
+        return self.status in RETRY_STATUSES or self.host_failed
+
+    @property
+    def settled(self) -> bool:
+        """
+        Возвращает True, если результат окончательный: ссылка работает или
+        ответила статусом, который не изменится при повторе (например, 404).
+        Таймауты, ошибки соединения, 429/5xx и отключенный хост к ним не относятся.
+        """
+        return self.ok or (self.status is not None and not self.retryable)
+
+    @property
+    def reason(self) -> str:
+        """
+        Возвращает описание ошибки для отчета.
+
+        Таймаут, ошибка соединения, отключенный хост и ответ 429
+        описываются отдельно, остальные статусы — их номером.
+        """
+        if self.error_type in TIMEOUT_ERRORS:
+            return "Превышено время ожидания ответа"
+        if self.error_type in CONNECTION_ERRORS:
+            return "Не удалось подключиться"
+        if self.error_type == HOST_DOWN_ERROR:
+            return "Хост недоступен"
+        if self.error is not None:
+            return "Возможно некорректная ссылка"
+        if self.status == 429:
+            return "429 Слишком много запросов"
+        return str(self.status)
+
+
+class _Task(NamedTuple):
+    """
+    Ссылка в очереди проверки.
+
+    Атрибуты:
+        url (str): Ссылка для проверки.
+        future (Future): Future, в который записывается результат проверки.
+        started (float | None): Время первой попытки по `time.perf_counter`.
+        attempts (int): Число отправленных запросов.
+    """
+    url: str
+    future: Future
+    started: Optional[float] = None
+    attempts: int = 0
+
+
+class _Host:
+    """
+    Очередь и ограничения для одного хоста. Поля `pending`, `active`
+    и `waking` изменяются только под блокировкой `LinkProber._host_lock`.
+
+    Атрибуты:
+        bucket (TokenBucket): Ограничение частоты запросов.
+        breaker (CircuitBreaker): Предохранитель для недоступного хоста.
+        pending (collections.deque): Ссылки (`_Task`), ожидающие свободного места
+            в пуле или окончания паузы хоста.
+        active (int): Число ссылок хоста, которые сейчас проверяются в пуле.
+        waking (bool): True, если разбор очереди уже запланирован на окончание паузы.
+    """
+    def __init__(self, bucket, breaker):
+        """
+        Инициализация объекта _Host.
+
+        Аргументы:
+            bucket (TokenBucket): Ограничение частоты запросов.
+            breaker (CircuitBreaker): Предохранитель для недоступного хоста.
+        """
+        self.bucket = bucket
+        self.breaker = breaker
+        self.pending = deque()
+        self.active = 0
+        self.waking = False
+
+
+class LinkProber:
+    """
+    Класс для параллельной проверки ссылок.
+
+    Атрибуты:
+        timeout (float): Таймаут ожидания ответа в секундах.
+        connect_timeout (float): Таймаут установки соединения в секундах.
+        retries (int): Число повторов запроса при временной ошибке.
+        session (requests.Session): Общая сессия с пулом keep-alive соединений.
+        executor (ThreadPoolExecutor): Пул потоков для выполнения запросов.
+        scheduler (Scheduler): Поток, который возвращает в очередь ссылки
+            после паузы хоста или задержки перед повтором.
+        cache (LinkCache | None): Кэш результатов проверки.
+        seen (SeenIndex | None): Индекс ссылок, которые уже ответили статусом 200.
+    """
+    def __init__(self, max_workers=20, per_host=4, timeout=30, cache=None, max_redirects=10,
+                 connect_timeout=10, retries=2, host_rate=10, breaker_threshold=5,
+                 breaker_cooldown=60, max_retry_after=60, seen=None):
+        """
+        Инициализация объекта LinkProber.
+
+        Аргументы:
+            max_workers (int): Максимальное число одновременных проверок.
+            per_host (int): Максимальное число одновременных запросов к одному хосту.
+            timeout (float): Таймаут ожидания ответа в секундах.
+            cache (LinkCache, optional): Кэш результатов проверки.
+            max_redirects (int): Максимальное число перенаправлений для одной ссылки.
+            connect_timeout (float): Таймаут установки соединения в секундах.
+            retries (int): Число повторов запроса при ответах 429/5xx и таймаутах.
+            host_rate (float): Максимальное число запросов в секунду к одному хосту.
+                0 отключает ограничение.
+            breaker_threshold (int): Число таймаутов и ошибок соединения подряд,
+                после которого хост считается недоступным. 0 отключает проверку.
+            breaker_cooldown (float): Сколько секунд не отправлять запросы
+                к недоступному хосту.
+            max_retry_after (float): Максимальное ожидание по заголовку Retry-After;
+                если сервер просит ждать дольше, запрос не повторяется.
+            seen (SeenIndex, optional): Индекс рабочих ссылок на весь запуск. В отличие
+                от кэша, он не вытесняет записи, поэтому рабочая ссылка проверяется
+                один раз за запуск при любом числе ссылок.
+        """
+        self.timeout = timeout
+        self.connect_timeout = min(connect_timeout, timeout)
+        self.retries = retries
+        self.cache = cache
+        self.seen = seen
+        self.max_redirects = max_redirects
+        self.per_host = per_host
+        self.host_rate = host_rate
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self.max_retry_after = max_retry_after
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=100, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers,
+                                           thread_name_prefix='prober')
+        self.scheduler = Scheduler(name='prober-scheduler')
+        self._hosts = {}
+        self._host_lock = threading.Lock()
+        self._idle = threading.Condition(self._host_lock)
+        self._tasks = 0
+        self._in_flight = {}
+        self._in_flight_lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def submit(self, url):
+        """
+        Ставит ссылку в очередь на проверку.
+
+        Аргументы:
+            url (str): Ссылка для проверки.
+
+        Возвращает:
+            Future: Объект Future, результатом которого будет `ProbeResult`.
+
+        Описание:
+            - Если ссылка уже есть в кэше, возвращает готовый результат.
+            - Если ссылка уже ответила статусом 200 в этом запуске (есть в индексе
+              `seen`), возвращает готовый рабочий результат.
+            - Если ссылка уже проверяется, возвращает тот же Future.
+            - Иначе ставит ссылку в очередь ее хоста. Поток пула получают
+              не больше `per_host` ссылок одного хоста одновременно, поэтому
+              медленный хост не занимает весь пул.
+        """
+        if self.cache is not None:
+            try:
+                result = self.cache.get(url)
+            except Exception as e: # pylint: disable=broad-exception-caught
+                log_error(f"Не удалось прочитать кэш: {e}", url=url, exc=e)
+                result = None
+            if result is not None:
+                future = Future()
+                future.set_result(result)
+                return future
+
+        key = normalize_url(url)
+        if self.seen is not None and key in self.seen:
+            future = Future()
+            future.set_result(ProbeResult(url, status=200, final_url=url, attempts=0))
+            return future
+        with self._in_flight_lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                return future
+            future = Future()
+            self._in_flight[key] = future
+        future.add_done_callback(lambda _: self._forget(key))
+        with self._idle:
+            self._tasks += 1
+        self._enqueue(_Task(url, future))
+        return future
+
+    def close(self) -> None:
+        """
+        Дожидается завершения проверок и закрывает пул потоков и сессию.
+        """
+        with self._idle:
+            self._idle.wait_for(lambda: not self._tasks)
+        self.scheduler.close()
+        self.executor.shutdown(wait=True)
+        self.session.close()
+
+    def _forget(self, key):
+        """
+        Удаляет завершенную проверку из списка выполняющихся.
+
+        Аргументы:
+            key (str): Нормализованная ссылка.
+        """
+        with self._in_flight_lock:
+            self._in_flight.pop(key, None)
+
+    def _host(self, url):
+        """
+        Возвращает ограничения для хоста ссылки.
+
+        Аргументы:
+            url (str): Ссылка, для хоста которой нужны ограничения.
+
+        Возвращает:
+            _Host: Очередь, ограничение частоты и предохранитель хоста.
+        """
+        host = urlsplit(url).netloc.lower()
+        with self._host_lock:
+            if host not in self._hosts:
+                self._hosts[host] = _Host(
+                    TokenBucket(self.host_rate, burst=self.per_host),
+                    CircuitBreaker(self.breaker_threshold, self.breaker_cooldown),
+                )
+            return self._hosts[host]
+
+    def _enqueue(self, task, host=None):
+        """
+        Ставит ссылку в очередь ее хоста.
+
+        Аргументы:
+            task (_Task): Ссылка в очереди проверки.
+            host (_Host, optional): Хост ссылки, если он уже известен.
+        """
+        host = host or self._host(task.url)
+        with self._host_lock:
+            host.pending.append(task)
+            self._dispatch(host)
+
+    def _dispatch(self, host):
+        """
+        Передает в пул ссылки хоста, пока у него есть свободные места.
+        Вызывается под блокировкой `_host_lock`.
+
+        Аргументы:
+            host (_Host): Хост, очередь которого нужно разобрать.
+
+        Описание:
+            Если ограничение частоты или пауза по Retry-After не разрешают
+            запрос, ссылки остаются в очереди, а ее разбор планируется на время,
+            когда запрос станет возможен. Поток пула при этом не занимается.
+            Отмененные ссылки удаляются из очереди без запроса.
+        """
+        while host.pending and host.active < self.per_host:
+            if host.pending[0].future.cancelled():
+                host.pending.popleft()
+                self._tasks -= 1
+                self._idle.notify_all()
+                continue
+            if host.waking:
+                return
+            delay = host.bucket.reserve()
+            if delay > 0:
+                host.waking = True
+                self.scheduler.call_later(delay, lambda: self._wake(host))
+                return
+            host.active += 1
+            self.executor.submit(self._run, host, host.pending.popleft())
+
+    def _wake(self, host):
+        """
+        Разбирает очередь хоста после окончания паузы.
+
+        Аргументы:
+            host (_Host): Хост, пауза которого закончилась.
+        """
+        with self._host_lock:
+            host.waking = False
+            self._dispatch(host)
+
+    def _run(self, host, task):
+        """
+        Отправляет один запрос к ссылке в потоке пула.
+
+        Аргументы:
+            host (_Host): Хост ссылки.
+            task (_Task): Ссылка в очереди проверки.
+
+        Описание:
+            - Если хост отключен предохранителем, сразу возвращает ошибку.
+            - При ответах 429/5xx и таймаутах ставит ссылку в очередь снова, до
+              `retries` повторов. Если задан заголовок Retry-After, все запросы
+              к хосту приостанавливаются на указанное время, иначе повтор
+              откладывается на экспоненциальную задержку. Ожидание проходит
+              вне пула, поэтому потоки заняты только отправкой запросов.
+        """
+        retry = None
+        cancelled = False
+        try:
+            if task.attempts or task.future.set_running_or_notify_cancel():
+                retry, task = self._attempt(host, task)
+            else:
+                cancelled = True
+        except Exception as e: # pylint: disable=broad-exception-caught
+            self._finish(task, ProbeResult(task.url, error=str(e),
+                                           error_type=type(e).__name__))
+        finally:
+            with self._host_lock:
+                host.active -= 1
+                if cancelled:
+                    self._tasks -= 1
+                if retry == 0:
+                    host.pending.appendleft(task)
+                self._dispatch(host)
+                self._idle.notify_all()
+        if retry:
+            self.scheduler.call_later(retry, lambda: self._enqueue(task, host))
+
+    def _attempt(self, host, task):
+        """
+        Выполняет одну попытку проверки ссылки.
+
+        Аргументы:
+            host (_Host): Хост ссылки.
+            task (_Task): Ссылка в очереди проверки.
+
+        Возвращает:
+            tuple: Пара (через сколько секунд повторить запрос или None, если
+                проверка завершена; 0 — повторить после паузы хоста, задача с
+                учетом этой попытки).
+        """
+        url = task.url
+        task = task._replace(started=task.started or time.perf_counter())
+        if not host.breaker.allow():
+            result = ProbeResult(url, error=f"Хост не отвечает: {host.breaker.failures} "
+                                            f"ошибок подряд", error_type=HOST_DOWN_ERROR)
+            self._finish(task, result)
+            return None, task
+        task = task._replace(attempts=task.attempts + 1)
+        wait = None
+        try:
+            result, wait = self._follow(url)
+        except Exception as e: # pylint: disable=broad-exception-caught
+            result = ProbeResult(url, error=str(e), error_type=type(e).__name__)
+        host.breaker.record(not result.host_failed)
+        if task.attempts <= self.retries and result.retryable:
+            if wait is None:
+                return backoff_delay(task.attempts - 1), task
+            if wait <= self.max_retry_after:
+                host.bucket.pause(wait)
+                return 0, task
+        self._finish(task, result)
+        return None, task
+
+    def _finish(self, task, result):
+        """
+        Сохраняет окончательный результат проверки ссылки.
+
+        Аргументы:
+            task (_Task): Ссылка в очереди проверки.
+            result (ProbeResult): Результат последней попытки.
+        """
+        url = task.url
+        elapsed = time.perf_counter() - task.started if task.started else 0.0
+        result = result._replace(elapsed=elapsed, attempts=task.attempts)
+        METRICS.observe('link_probe', result.elapsed, host=urlsplit(url).netloc.lower())
+        if self.cache is not None:
+            try:
+                self.cache.put(result)
+            except Exception as e: # pylint: disable=broad-exception-caught
+                log_error(f"Не удалось сохранить результат в кэш: {e}", url=url, exc=e)
+        if self.seen is not None and result.ok:
+            self.seen.add(normalize_url(url))
+        task.future.set_result(result)
+        with self._idle:
+            self._tasks -= 1
+            self._idle.notify_all()
+
+    def _follow(self, url):
+        """
+        Проходит по цепочке перенаправлений, не скачивая тела ответов.
+
+        Аргументы:
+            url (str): Ссылка для проверки.
+
+        Возвращает:
+            tuple: Пара (ProbeResult с итоговым статусом, итоговой ссылкой и всеми
+                переходами, число секунд из заголовка Retry-After или None).
+        """
+        current = url
+        redirects = []
+        for _ in range(self.max_redirects + 1):
+            with self._send(current) as response:
+                METRICS.observe('link_ttfb', response.elapsed.total_seconds(),
+                                host=urlsplit(current).netloc.lower())
+                location = response.headers.get('location')
+                if not response.is_redirect or not location:
+                    wait = None
+                    if response.status_code in RETRY_STATUSES:
+                        wait = retry_after(response.headers.get('retry-after'))
+                    return ProbeResult(url, status=response.status_code, final_url=current,
+                                       redirects=tuple(redirects)), wait
+                current = urljoin(current, location)
+                redirects.append(f"{response.status_code} {current}")
+        return ProbeResult(url, error=f"Больше {self.max_redirects} перенаправлений",
+                           final_url=current, redirects=tuple(redirects)), None
+
+    def _send(self, url):
+        """
+        Отправляет запрос HEAD, а если сервер его не поддерживает — потоковый GET.
+
+        Аргументы:
+            url (str): Ссылка для запроса.
+
+        Возвращает:
+            requests.Response: Ответ, у которого прочитаны только заголовки.
+        """
+        timeout = (self.connect_timeout, self.timeout)
+        response = self.session.head(url, timeout=timeout, allow_redirects=False)
+        if response.status_code in (405, 501):
+            response.close()
+            response = self.session.get(url, timeout=timeout,
+                                        allow_redirects=False, stream=True)
+        return response
@@ -0,0 +1,249 @@
+"""Модуль для потоковой записи отчетов о неработающих ссылках.
+
+Этот модуль содержит классы, которые записывают найденные неработающие ссылки
+сразу, а не копят их в памяти до конца проверки. Память не растет с числом
+найденных ссылок, а файлы CSV и JSONL регулярно сбрасываются на диск,
+поэтому при аварийном завершении программы уже найденные данные сохраняются.
+
+Основные классы:
+- `XlsxSink`: Запись в Excel файл в потоковом режиме openpyxl (write-only).
+- `CsvSink`: Запись в CSV файл.
+- `JsonlSink`: Запись в JSONL файл, по одному объекту на строку.
+- `ReportWriter`: Запись одновременно в несколько форматов.
+
+Пример использования:
+```python
+with ReportWriter('https://example.by/news/', formats=('xlsx', 'csv')) as report:
+    report.write(broken_link)
+```
+"""
+
+import csv
+import json
+import time
+import openpyxl
+from metrics import METRICS
+from results import HEADERS
+from utils import clean_filename, print_slowly
+
+
+FORMATS = ('xlsx', 'csv', 'jsonl')
+
+
+class _FileSink:
+    """
+    Базовый класс текстового отчета. Файл создается при записи первой строки
+    и сбрасывается на диск каждые `flush_every` строк или `flush_interval` секунд.
+
+    Атрибуты:
+        filename (str): Имя файла отчета.
+        rows (int): Число записанных строк.
+    """
+    encoding = 'utf-8'
+
+    def __init__(self, filename, flush_every=50, flush_interval=5):
+        """
+        Инициализация объекта отчета.
+
+        Аргументы:
+            filename (str): Имя файла отчета.
+            flush_every (int): Через сколько строк сбрасывать данные на диск.
+            flush_interval (float): Через сколько секунд сбрасывать данные на диск.
+        """
+        self.filename = filename
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.rows = 0
+        self._file = None
+        self._unflushed = 0
+        self._flushed_at = time.monotonic()
+
+    def write(self, link) -> None:
+        """
+        Записывает одну неработающую ссылку.
+
+        Аргументы:
+            link (BrokenLink): Неработающая ссылка.
+        """
+        if self._file is None:
+            self._file = open(self.filename, 'w', encoding=self.encoding, newline='')
+            self._start()
+        self._write(link)
+        self.rows += 1
+        self._unflushed += 1
+        if (self._unflushed >= self.flush_every
+                or time.monotonic() - self._flushed_at >= self.flush_interval):
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Сбрасывает записанные строки на диск.
+        """
+        if self._file is not None and self._unflushed:
+            self._file.flush()
+            self._unflushed = 0
+            self._flushed_at = time.monotonic()
+
+    def close(self) -> None:
+        """
+        Сбрасывает данные на диск и закрывает файл.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _start(self):
+        """Записывает начало файла, например заголовки столбцов."""
+
+    def _write(self, link):
+        raise NotImplementedError
+
+
+class CsvSink(_FileSink):
+    """
+    Отчет в формате CSV с теми же столбцами, что и Excel файл.
+    Файл начинается с BOM, чтобы Excel правильно показывал кириллицу.
+    """
+    encoding = 'utf-8-sig'
+
+    def __init__(self, filename, flush_every=50, flush_interval=5):
+        super().__init__(filename, flush_every, flush_interval)
+        self._writer = None
+
+    def _start(self):
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(HEADERS)
+
+    def _write(self, link):
+        self._writer.writerow(link.as_row())
+
+
+class JsonlSink(_FileSink):
+    """
+    Отчет в формате JSONL: одна неработающая ссылка на строку.
+    """
+    def _write(self, link):
+        self._file.write(json.dumps(link._asdict(), ensure_ascii=False) + '\n')
+
+
+class XlsxSink:
+    """
+    Отчет в формате Excel. Книга создается в режиме write-only: openpyxl
+    сразу выгружает строки во временный файл и не держит их в памяти.
+    Готовый файл .xlsx появляется при закрытии отчета.
+
+    Атрибуты:
+        filename (str): Имя файла отчета.
+        rows (int): Число записанных строк.
+    """
+    def __init__(self, filename):
+        """
+        Инициализация объекта XlsxSink.
+
+        Аргументы:
+            filename (str): Имя файла отчета.
+        """
+        self.filename = filename
+        self.rows = 0
+        self._workbook = None
+        self._sheet = None
+
+    def write(self, link) -> None:
+        """
+        Записывает одну неработающую ссылку.
+
+        Аргументы:
+            link (BrokenLink): Неработающая ссылка.
+        """
+        if self._workbook is None:
+            self._workbook = openpyxl.Workbook(write_only=True)
+            self._sheet = self._workbook.create_sheet("Error")
+            self._sheet.append(HEADERS)
+        self._sheet.append(link.as_row())
+        self.rows += 1
+
+    def flush(self) -> None:
+        """
+        Ничего не делает: файл Excel можно записать только целиком при закрытии.
+        """
+
+    def close(self) -> None:
+        """
+        Сохраняет файл Excel.
+        """
+        if self._workbook is not None:
+            self._workbook.save(self.filename)
+            self._workbook = None
+
+
+class ReportWriter:
+    """
+    Отчет о неработающих ссылках для одного URL-адреса в одном или нескольких форматах.
+
+    Атрибуты:
+        sinks (list): Отчеты в каждом из выбранных форматов.
+        rows (int): Число записанных неработающих ссылок.
+    """
+    def __init__(self, url, formats=('xlsx',)):
+        """
+        Инициализация объекта ReportWriter.
+
+        Аргументы:
+            url (str): URL-адрес, используемый для формирования имен файлов.
+            formats (Iterable[str]): Форматы отчета: `xlsx`, `csv`, `jsonl`.
+        """
+        basename = f"error{clean_filename(url)}"
+        self.sinks = []
+        for fmt in formats:
+            filename = f"{basename}.{fmt}"
+            if fmt == 'xlsx':
+                self.sinks.append(XlsxSink(filename))
+            elif fmt == 'csv':
+                self.sinks.append(CsvSink(filename))
+            elif fmt == 'jsonl':
+                self.sinks.append(JsonlSink(filename))
+            else:
+                raise ValueError(f"Неизвестный формат отчета: {fmt}")
+        self.rows = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def filenames(self) -> list:
+        """
+        Имена созданных файлов отчета.
+        """
+        return [sink.filename for sink in self.sinks if sink.rows]
+
+    def write(self, link) -> None:
+        """
+        Записывает одну неработающую ссылку во все форматы.
+
+        Аргументы:
+            link (BrokenLink): Неработающая ссылка.
+        """
+        with METRICS.timer('report_write'):
+            for sink in self.sinks:
+                sink.write(link)
+        self.rows += 1
+
+    def flush(self) -> None:
+        """
+        Сбрасывает на диск записанные строки во всех форматах, где это возможно.
+        """
+        for sink in self.sinks:
+            sink.flush()
+
+    def close(self) -> None:
+        """
+        Закрывает все файлы отчета и сообщает, куда сохранены данные.
+        """
+        with METRICS.timer('report_save'):
+            for sink in self.sinks:
+                sink.close()
+        for filename in self.filenames:
+            print_slowly(f"Данные успешно сохранены в файл {filename}\n")
@@ -0,0 +1,89 @@
+"""Модуль с описанием результатов проверки ссылок.
+
+Этот модуль содержит неизменяемые классы `BrokenLink`, который описывает
+одну неработающую ссылку, и `CheckSummary` с итогами проверки одного URL-адреса.
+Каждая проверка создает собственные объекты, поэтому потоки не разделяют
+общий изменяемый список.
+
+Пример использования:
+```python
+link = BrokenLink("Новость", "https://example.by/news/1/", 404,
+                  "текст", "https://example.com/")
+sheet.append(link.as_row())
+```
+"""
+
+from typing import NamedTuple, Union
+
+
+HEADERS = (
+    "Основная статья",
+    "Ссылка на основную статью",
+    "Ошибка",
+    "Текст ссылки в основной статье",
+    "Неработающая ссылка",
+    "Итоговая ссылка",
+    "Перенаправления",
+    "Тип ссылки",
+)
+
+
+class BrokenLink(NamedTuple):
+    """
+    Неработающая ссылка, найденная в новости.
+
+    Атрибуты:
+        article_title (str): Заголовок новости.
+        article_url (str): Ссылка на новость.
+        error (int | str): HTTP-статус или описание ошибки.
+        link_text (str): Текст ссылки в новости.
+        link_url (str): Неработающая ссылка.
+        final_url (str): Ссылка после всех перенаправлений.
+        redirects (tuple): Переходы в виде строк "<статус> <ссылка>".
+        link_type (str): Тип ссылки: внутренняя или внешняя.
+    """
+    article_title: str
+    article_url: str
+    error: Union[int, str]
+    link_text: str
+    link_url: str
+    final_url: str = ""
+    redirects: tuple = ()
+    link_type: str = ""
+
+    def as_row(self) -> list:
+        """
+        Возвращает значения в порядке столбцов `HEADERS`.
+        """
+        return [
+            self.article_title,
+            self.article_url,
+            self.error,
+            self.link_text,
+            self.link_url,
+            self.final_url,
+            " -> ".join(self.redirects),
+            self.link_type,
+        ]
+
+
+class CheckSummary(NamedTuple):
+    """
+    Итоги проверки одного URL-адреса.
+
+    Атрибуты:
+        url (str): Проверенный URL-адрес.
+        articles (int): Число обработанных новостей.
+        links (int): Число проверенных ссылок.
+        broken (int): Число неработающих ссылок.
+        reports (tuple): Имена созданных файлов отчета.
+        failed (bool): True, если проверка не удалась: сайт не ответил, новости
+            не найдены или произошла ошибка. Нули в итогах тогда не означают,
+            что неработающих ссылок нет.
+    """
+    url: str
+    articles: int = 0
+    links: int = 0
+    broken: int = 0
+    reports: tuple = ()
+    failed: bool = False
@@ -0,0 +1,263 @@
+"""Модуль для бережной работы с внешними хостами.
+
+Этот модуль содержит классы, с помощью которых `LinkProber` ограничивает
+нагрузку на каждый хост и не ждет таймаута на хостах, которые полностью
+недоступны.
+
+Основные функции:
+- `TokenBucket`: Ограничение частоты запросов к хосту (token bucket).
+- `CircuitBreaker`: Быстрый отказ для хоста после серии ошибок подряд.
+- `Scheduler`: Отложенный вызов функций в одном фоновом потоке, чтобы
+  ожидание перед запросом не занимало поток пула.
+- `backoff_delay`: Экспоненциальная задержка перед повтором со случайным разбросом.
+- `retry_after`: Разбор заголовка Retry-After.
+
+Пример использования:
+```python
+bucket = TokenBucket(rate=5, burst=5)
+breaker = CircuitBreaker(threshold=5, cooldown=60)
+scheduler = Scheduler()
+
+def send():
+    delay = bucket.reserve()
+    if delay:
+        scheduler.call_later(delay, send)
+    elif breaker.allow():
+        breaker.record(success=True)
+
+send()
+```
+"""
+
+import heapq
+import itertools
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from logs import log_error
+
+
+class TokenBucket:
+    """
+    Потокобезопасное ограничение частоты запросов.
+
+    Атрибуты:
+        rate (float): Число запросов в секунду. 0 отключает ограничение.
+        burst (int): Сколько запросов можно отправить подряд без ожидания.
+    """
+    def __init__(self, rate, burst=1):
+        """
+        Инициализация объекта TokenBucket.
+
+        Аргументы:
+            rate (float): Число запросов в секунду. 0 отключает ограничение.
+            burst (int): Сколько запросов можно отправить подряд без ожидания.
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Пытается получить разрешение на один запрос, не дожидаясь его.
+
+        Возвращает:
+            float: 0, если разрешение получено, иначе через сколько секунд
+                стоит попробовать снова.
+        """
+        with self._lock:
+            now = time.monotonic()
+            wait = self._paused_until - now
+            if wait > 0:
+                return wait
+            if not self.rate:
+                return 0.0
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def pause(self, seconds) -> None:
+        """
+        Запрещает запросы к хосту на заданное время, например по заголовку Retry-After.
+
+        Аргументы:
+            seconds (float): Длительность паузы в секундах.
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+class CircuitBreaker:
+    """
+    Потокобезопасный предохранитель для одного хоста.
+
+    После `threshold` ошибок подряд хост считается недоступным, и в течение
+    `cooldown` секунд запросы к нему не отправляются. Затем пропускается
+    один пробный запрос: если он успешен, хост снова считается доступным.
+
+    Атрибуты:
+        threshold (int): Число ошибок подряд, после которого хост отключается.
+        cooldown (float): Сколько секунд хост остается отключенным.
+    """
+    def __init__(self, threshold=5, cooldown=60):
+        """
+        Инициализация объекта CircuitBreaker.
+
+        Аргументы:
+            threshold (int): Число ошибок подряд, после которого хост отключается.
+                0 отключает предохранитель.
+            cooldown (float): Сколько секунд хост остается отключенным.
+        """
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._failures = 0
+        self._opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def failures(self) -> int:
+        """Возвращает число ошибок подряд."""
+        return self._failures
+
+    def allow(self) -> bool:
+        """
+        Проверяет, можно ли отправить запрос к хосту.
+
+        Возвращает:
+            bool: False, если хост отключен и пробный запрос уже выполняется
+                или время отключения еще не истекло.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._trial or time.monotonic() - self._opened_at < self.cooldown:
+                return False
+            self._trial = True
+            return True
+
+    def record(self, success) -> None:
+        """
+        Запоминает результат запроса к хосту.
+
+        Аргументы:
+            success (bool): True, если хост ответил.
+        """
+        with self._lock:
+            self._trial = False
+            if success:
+                self._failures = 0
+                self._opened_at = None
+                return
+            self._failures += 1
+            if self.threshold and self._failures >= self.threshold:
+                self._opened_at = time.monotonic()
+
+
+class Scheduler:
+    """
+    Вызывает функции через заданное время в одном фоновом потоке.
+
+    Функции должны выполняться быстро, например ставить задачу в очередь
+    пула: пока выполняется одна функция, остальные ждут.
+    """
+    def __init__(self, name='scheduler'):
+        """
+        Инициализация объекта Scheduler.
+
+        Аргументы:
+            name (str): Имя фонового потока.
+        """
+        self._queue = []
+        self._order = itertools.count()
+        self._closed = False
+        self._ready = threading.Condition()
+        self._thread = threading.Thread(target=self._loop, name=name, daemon=True)
+        self._thread.start()
+
+    def call_later(self, delay, func) -> None:
+        """
+        Планирует вызов функции.
+
+        Аргументы:
+            delay (float): Через сколько секунд вызвать функцию.
+            func (Callable[[], None]): Функция без аргументов.
+        """
+        with self._ready:
+            heapq.heappush(self._queue, (time.monotonic() + max(0.0, delay),
+                                         next(self._order), func))
+            self._ready.notify()
+
+    def close(self) -> None:
+        """
+        Останавливает фоновый поток. Запланированные вызовы не выполняются.
+        """
+        with self._ready:
+            self._closed = True
+            self._ready.notify()
+        self._thread.join()
+
+    def _loop(self):
+        """Выполняет функции, время вызова которых наступило."""
+        while True:
+            with self._ready:
+                while not self._closed:
+                    if self._queue:
+                        wait = self._queue[0][0] - time.monotonic()
+                        if wait <= 0:
+                            break
+                        self._ready.wait(wait)
+                    else:
+                        self._ready.wait()
+                if self._closed:
+                    return
+                _, _, func = heapq.heappop(self._queue)
+            try:
+                func()
+            except Exception as e: # pylint: disable=broad-exception-caught
+                log_error(f"Ошибка отложенного вызова: {e}", exc=e)
+
+
+def backoff_delay(attempt, base=0.5, cap=30) -> float:
+    """
+    Вычисляет задержку перед повтором запроса.
+
+    Аргументы:
+        attempt (int): Номер повтора, начиная с 0.
+        base (float): Задержка перед первым повтором в секундах.
+        cap (float): Максимальная задержка в секундах.
+
+    Возвращает:
+        float: Случайная задержка от 0 до min(cap, base * 2 ** attempt),
+            чтобы повторы разных потоков не приходили на хост одновременно.
+    """
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def retry_after(value):
+    """
+    Разбирает заголовок Retry-After.
+
+    Аргументы:
+        value (str | None): Значение заголовка: число секунд или дата HTTP.
+
+    Возвращает:
+        float | None: Число секунд ожидания или None, если заголовок не задан
+            или имеет неправильный формат.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
@@ -0,0 +1,225 @@
+"""Модуль для приведения ссылок к единому виду и учета проверенных адресов.
+
+Этот модуль содержит класс `LinkNormalizer`, который перед проверкой
+разрешает относительные ссылки, убирает фрагмент и служебные параметры
+запроса (utm-метки и т. п.), пропускает ссылки со схемами mailto:, tel:,
+javascript: и другими, которые нельзя проверить HTTP-запросом, и делит
+ссылки на внутренние и внешние. Класс `SeenIndex` — компактный индекс
+уже проверенных рабочих адресов для всего запуска: набор 64-битных хэшей
+или, для очень больших обходов, фильтр Блума фиксированного размера.
+
+Основные функции:
+- `LinkNormalizer.normalize`: Ссылка в едином виде или None, если ее не нужно проверять.
+- `LinkNormalizer.kind`: Тип ссылки: внутренняя или внешняя.
+- `SeenIndex`: Компактный индекс проверенных адресов.
+
+Пример использования:
+```python
+normalizer = LinkNormalizer(strip_params=('utm_*', 'ref'))
+url = normalizer.normalize('/about/?utm_source=x#top', 'https://example.by/news/1/')
+seen = SeenIndex('bloom', capacity=1_000_000)
+seen.add(url)
+print(url in seen, normalizer.kind(url, 'https://example.by/news/1/'))
+```
+"""
+
+import hashlib
+import math
+import threading
+from urllib.parse import urljoin, urlsplit, urlunsplit
+from utils import normalize_url
+
+
+TRACKING_PARAMS = ('utm_*', 'fbclid', 'gclid', 'yclid', 'ysclid', '_openstat',
+                   'mc_cid', 'mc_eid')
+HTTP_SCHEMES = ('http', 'https')
+INDEX_MODES = ('hash', 'bloom')
+
+INTERNAL = "внутренняя"
+EXTERNAL = "внешняя"
+
+_LOW_64 = 2 ** 64 - 1
+
+
+def _site(host) -> str:
+    """
+    Возвращает хост без префикса www. для сравнения сайтов.
+
+    Аргументы:
+        host (str): Хост в нижнем регистре.
+    """
+    return host[4:] if host.startswith('www.') else host
+
+
+class LinkNormalizer:
+    """
+    Приведение ссылок к единому виду перед проверкой.
+
+    Атрибуты:
+        strip_params (tuple): Параметры запроса, которые удаляются из ссылки;
+            имя с `*` на конце удаляет все параметры с таким началом.
+    """
+    def __init__(self, strip_params=TRACKING_PARAMS):
+        """
+        Инициализация объекта LinkNormalizer.
+
+        Аргументы:
+            strip_params (Iterable[str]): Параметры запроса, которые удаляются из ссылки.
+        """
+        self.strip_params = tuple(strip_params)
+        self._exact = {name.lower() for name in self.strip_params if not name.endswith('*')}
+        self._prefixes = tuple(name[:-1].lower() for name in self.strip_params
+                               if name.endswith('*'))
+
+    def normalize(self, href, base_url):
+        """
+        Приводит ссылку к единому виду.
+
+        Аргументы:
+            href (str): Ссылка из атрибута href.
+            base_url (str): Адрес страницы, относительно которого разрешается ссылка.
+
+        Описание:
+            Параметры запроса не декодируются и не кодируются заново: удаляются
+            только части запроса между `&` со служебными именами, а если удалять
+            нечего, запрос остается без изменений. Поэтому ссылки в кодировке
+            cp1251, параметры без значения и с `;` проверяются в исходном виде.
+
+        Возвращает:
+            str | None: Абсолютная ссылка без фрагмента и служебных параметров
+                или None, если у ссылки не HTTP-схема (mailto:, tel:, javascript: и т. п.)
+                или она ведет только на фрагмент текущей страницы.
+        """
+        href = href.strip()
+        if not href or href.startswith('#'):
+            return None
+        url = urljoin(base_url, href)
+        parts = urlsplit(url)
+        if parts.scheme.lower() not in HTTP_SCHEMES or not parts.netloc:
+            return None
+        if parts.query:
+            segments = parts.query.split('&')
+            kept = [segment for segment in segments
+                    if not self._stripped(segment.split('=', 1)[0])]
+            if len(kept) != len(segments):
+                url = urlunsplit(parts._replace(query='&'.join(kept)))
+        return normalize_url(url)
+
+    @staticmethod
+    def kind(url, article_url) -> str:
+        """
+        Определяет, ведет ли ссылка на тот же сайт, что и новость.
+
+        Аргументы:
+            url (str): Проверяемая ссылка.
+            article_url (str): Ссылка на новость.
+
+        Возвращает:
+            str: `внутренняя` или `внешняя`. Некорректная ссылка, у которой
+                нельзя определить хост, считается внешней.
+        """
+        try:
+            same = (_site(urlsplit(url).netloc.lower())
+                    == _site(urlsplit(article_url).netloc.lower()))
+        except ValueError:
+            return EXTERNAL
+        return INTERNAL if same else EXTERNAL
+
+    def _stripped(self, name) -> bool:
+        """
+        Проверяет, нужно ли удалить параметр запроса.
+
+        Аргументы:
+            name (str): Имя параметра.
+        """
+        name = name.lower()
+        return name in self._exact or name.startswith(self._prefixes)
+
+
+class SeenIndex:
+    """
+    Потокобезопасный компактный индекс адресов.
+
+    В режиме `hash` хранит 64-битные хэши адресов вместо самих строк. В режиме
+    `bloom` использует фильтр Блума: память не растет с числом адресов, но с
+    вероятностью `error_rate` непроверенный адрес может считаться проверенным.
+
+    Атрибуты:
+        mode (str): Режим: `hash` или `bloom`.
+    """
+    def __init__(self, mode='hash', capacity=10_000_000, error_rate=0.001):
+        """
+        Инициализация объекта SeenIndex.
+
+        Аргументы:
+            mode (str): Режим: `hash` или `bloom`.
+            capacity (int): Ожидаемое число адресов для фильтра Блума.
+            error_rate (float): Допустимая доля ложных совпадений фильтра Блума.
+        """
+        if mode not in INDEX_MODES:
+            raise ValueError(f"неизвестный режим индекса: {mode}")
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._count = 0
+        self._hashes = set()
+        if mode == 'bloom':
+            bits = -capacity * math.log(error_rate) / math.log(2) ** 2
+            self._bits_count = max(8, math.ceil(bits))
+            self._hash_count = max(1, round(self._bits_count / capacity * math.log(2)))
+            self._bits = bytearray((self._bits_count + 7) // 8)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, url) -> bool:
+        digest = self._digest(url)
+        with self._lock:
+            if self.mode == 'hash':
+                return digest & _LOW_64 in self._hashes
+            return all(self._bits[bit >> 3] & (1 << (bit & 7)) for bit in self._positions(digest))
+
+    def add(self, url) -> bool:
+        """
+        Добавляет адрес в индекс.
+
+        Аргументы:
+            url (str): Адрес в едином виде.
+
+        Возвращает:
+            bool: True, если адреса еще не было в индексе.
+        """
+        digest = self._digest(url)
+        with self._lock:
+            if self.mode == 'hash':
+                added = digest & _LOW_64 not in self._hashes
+                self._hashes.add(digest & _LOW_64)
+            else:
+                added = False
+                for bit in self._positions(digest):
+                    mask = 1 << (bit & 7)
+                    if not self._bits[bit >> 3] & mask:
+                        self._bits[bit >> 3] |= mask
+                        added = True
+            self._count += added
+            return added
+
+    @staticmethod
+    def _digest(url) -> int:
+        """
+        Возвращает 128-битный хэш адреса; в режиме `hash` хранятся его младшие 64 бита.
+
+        Аргументы:
+            url (str): Адрес.
+        """
+        return int.from_bytes(hashlib.blake2b(url.encode('utf-8'), digest_size=16).digest(),
+                              'little')
+
+    def _positions(self, digest):
+        """
+        Возвращает номера битов фильтра Блума для хэша (двойное хеширование).
+
+        Аргументы:
+            digest (int): 128-битный хэш адреса.
+        """
+        first, second = digest & _LOW_64, (digest >> 64) | 1
+        return [(first + i * second) % self._bits_count for i in range(self._hash_count)]
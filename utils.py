@@ -3,15 +3,17 @@
 
 Этот модуль содержит функции для измерения времени выполнения скрипта,
 очистки URL-адресов для использования в именах файлов
-и сохранения данных в Excel файл.
+и вывода текста в консоль.
 
 Основные функции:
+- `set_quiet`: Функция включения тихого режима для запуска по расписанию.
 - `print_slowly`: Функция вывода текста.
 - `get_time_script`: Декоратор для измерения времени выполнения функции.
 - `clean_filename`: Функция для очистки URL-адреса от недопустимых
 символов для использования в именах файлов.
-- `save_data`: Функция для сохранения данных о неработающих ссылках в Excel файл.
 - `is_valid_url`: Функция для проверки валидности ссылки.
+- `normalize_url`: Функция приведения ссылки к единому виду для кэширования.
+- `connect_database`: Функция открытия файла SQLite, общего для потоков и процессов.
 - `print_choice`: Функция вывода текста, дя выбора.
 - `animate_search`: Функция анимации коретки.
 
@@ -23,17 +25,36 @@ def my_function():
     # Ваш код
 
 cleaned_url = clean_filename('https://example.com/path/to/page')
-save_data(data_to_save, cleaned_url)
 """
 import time
 import threading
 import re
-import openpyxl
+import sqlite3
+from urllib.parse import urlsplit, urlunsplit
 
 
 # Добавляем блокировку для синхронизации вывода в консоль
 console_lock = threading.Lock()
 
+# Тихий режим: текст выводится сразу, без задержек, анимации и обратного отсчета
+_quiet = threading.Event()
+
+def set_quiet(quiet: bool = True) -> None:
+    """
+    Включает или выключает тихий режим вывода.
+
+    В тихом режиме `print_slowly` выводит строку целиком без задержки
+    и без блокировки `console_lock`, `animate_search` ничего не выводит,
+    а `get_time_script` не ждет перед закрытием программы.
+
+    Аргументы:
+        quiet (bool): True, чтобы включить тихий режим.
+    """
+    if quiet:
+        _quiet.set()
+    else:
+        _quiet.clear()
+
 def print_slowly(text, delay=0.05):
     """
     Выводит текст на экран посимвольно с заданной задержкой между символами.
@@ -54,6 +75,9 @@ def print_slowly(text, delay=0.05):
         >>> print_slowly("Привет, мир!", delay=0.1)
         Привет, мир!
     """
+    if _quiet.is_set():
+        print(text, flush=True)
+        return
     with console_lock:
         for char in text:
             print(char, end='', flush=True)
@@ -82,6 +106,8 @@ def get_time_script(fun):
         # Выводим время выполнения в консоль
         time_script_text = f"Время выполнения программы: {int(minutes)} минут {int(seconds)} секунд\n"
         print_slowly(time_script_text)
+        if _quiet.is_set():
+            return result
         # Выводим сообщения о закрытии программы через 5, 4, 3, 2, 1 секунд
         for i in range(5, 0, -1):
             end_time_script_text = f"Закрытие через {i}..."
@@ -109,51 +135,6 @@ def clean_filename(url):
     cleaned_url = re.sub(r'[^a-zA-Z0-9_]', '_', url)
     return cleaned_url
 
-def save_data(data_to_save, url):
-    """
-    Сохраняет данные о неработающих ссылках в Excel файл.
-    
-    Аргументы:
-        data_to_save (list): Список словарей с данными о неработающих ссылках.
-        url (str): URL-адрес, используемый для формирования имени файла.
-
-    Описание:
-        - Создает новый Excel файл.
-        - Записывает данные в файл.
-        - Сохраняет файл с именем, основанным на очищенном URL-адресе.
-    """
-    workbook = openpyxl.Workbook()
-    sheet = workbook.active
-    sheet.title = "Error"
-
-    # Заголовки столбцов
-    headers = [
-        "Основная статья",
-        "Ссылка на основную статью",
-        "Ошибка",
-        "Текст ссылки в основной статье",
-        "Неработающая ссылка"
-        ]
-    sheet.append(headers)
-
-    # Запись данных
-    for data in data_to_save:
-        sheet.append([
-            data["Основная статья"],
-            data["Ссылка на основную статью"],
-            data["Ошибка"],
-            data["Текст ссылки в основной статье"],
-            data["Неработающая ссылка"]
-            ])
-    cleaned_url = clean_filename(url)
-    # Определение имени файла в зависимости от URL
-    filename = f"error{cleaned_url}.xlsx"
-
-    # Сохранение файла
-    workbook.save(filename)
-    save_data_text = f"Данные успешно сохранены в файл {filename}\n"
-    print_slowly(save_data_text)
-
 def is_valid_url(url_input):
     """
     Проверяет валидность ссылки. 
@@ -166,6 +147,54 @@ def is_valid_url(url_input):
     pattern = r'^https?:\/\/[^\/]+\/[^\s]*\/$'
     return re.match(pattern, url_input) is not None
 
+def normalize_url(url: str) -> str:
+    """
+    Приводит ссылку к единому виду, чтобы одинаковые адреса совпадали в кэше.
+
+    Аргументы:
+        url (str): Исходная ссылка.
+
+    Возвращает:
+        str: Ссылка без фрагмента, с хостом в нижнем регистре и без порта по умолчанию.
+            Имя пользователя и пароль (`user:pass@`) сохраняются без изменений.
+    """
+    parts = urlsplit(url.strip())
+    try:
+        port = parts.port
+    except ValueError:
+        return url.strip()
+    scheme = parts.scheme.lower()
+    userinfo, at, _ = parts.netloc.rpartition('@')
+    host = (parts.hostname or '').lower()
+    if ':' in host:
+        host = f"[{host}]"
+    if port and (scheme, port) not in (('http', 80), ('https', 443)):
+        host = f"{host}:{port}"
+    return urlunsplit((scheme, userinfo + at + host, parts.path or '/', parts.query, ''))
+
+def connect_database(path) -> sqlite3.Connection:
+    """
+    Открывает файл SQLite, который могут одновременно использовать
+    потоки и процессы.
+
+    Аргументы:
+        path (str): Путь к файлу SQLite.
+
+    Описание:
+        Включает журнал WAL: чтение не блокируется записью, а каждое изменение
+        записывается короткой транзакцией, поэтому другой процесс ждет блокировку
+        не дольше одной записи.
+
+    Возвращает:
+        sqlite3.Connection: Соединение, которое можно использовать из разных потоков
+            под блокировкой вызывающего кода.
+    """
+    db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    return db
+
+
 def print_choice(urls: set) -> set:
     """
     Выводит информацию о программе. Запрашивает у пользователя ссылки.
@@ -231,7 +260,7 @@ def animate_search(stop_event):
         stop_event = threading.Event()
         animate_search(stop_event)
     """
-    while not stop_event.is_set():
+    while not stop_event.is_set() and not _quiet.is_set():
         with console_lock:
             print("\rВеду поиск - |", end='', flush=True)
             time.sleep(0.5)